@@ -146,6 +146,31 @@ class Config:
             "search_directory": "\\\\LUECHFS101\\Shared\\European_Customisation\\ECDC-Customised Robot SW Order File"
         })
 
+    def get_cache_settings(self):
+        return self.config_data.get("cache_settings", {
+            "wo_list_ttl": 120,
+            "wo_details_ttl": 3600,
+            "stale_ttl": 86400,
+            "max_entries": 512
+        })
+
+    def get_local_replica_settings(self):
+        return self.config_data.get("local_replica", {
+            "enabled": False,
+            "sync_interval": 300
+        })
+
+    def get_dt_settings(self):
+        return self.config_data.get("dt_settings", {
+            "workbook_engine": "auto"
+        })
+
+    def get_persistence_settings(self):
+        return self.config_data.get("persistence", {
+            "debounce_ms": 500,
+            "backend": "json"
+        })
+
     def get_station_dashboard_grid(self):
         return self.config_data.get("station_dashboard_grid", {
             "columns": 2  
@@ -0,0 +1,153 @@
+import json
+import os
+import re
+import threading
+import traceback
+
+import PyPDF2
+
+from config import get_app_data_path
+
+CACHE_FILE = "bom_memory_cache.json"
+MAX_CACHE_ENTRIES = 500
+
+# Ordered from most to least specific; the first two are the A05B-2600 memory line
+_MEMORY_PATTERNS = [
+    re.compile(r'A05B[-\s]2600[-\s]H\d+\s+.*?(FROM\s*\d+\s*MB\s*/\s*SRAM\s*\d+\s*MB)', re.IGNORECASE),
+    re.compile(r'A05B[-\s]2600[-\s]H\d+\s+.*?(FROM\s*\d+\s*MB[/\\]\s*SRAM\s*\d+\s*MB)', re.IGNORECASE),
+    re.compile(r'(FROM\s*\d+\s*MB\s*/\s*SRAM\s*\d+\s*MB)', re.IGNORECASE),
+    re.compile(r'(FROM\s*\d+\s*MB).*?(SRAM\s*\d+\s*MB)', re.IGNORECASE),
+]
+_A05B_PATTERNS = _MEMORY_PATTERNS[:2]
+_FROM_SRAM = re.compile(r'FROM\s+(\d+)\s*MB\s*[/\\]\s*SRAM\s+(\d+)\s*MB', re.IGNORECASE)
+
+
+def _format_match(match):
+    if len(match.groups()) == 1:
+        memory_info = match.group(1).strip()
+        # Normalize format (remove extra spaces)
+        memory_info = re.sub(r'\s+', ' ', memory_info)
+        # Replace "FROM xxxMB / SRAM yMB" with "FROMxxxMB/SRAMyMB"
+        return _FROM_SRAM.sub(r'FROM\1MB/SRAM\2MB', memory_info)
+    # Combine separate parts
+    from_part = re.sub(r'\s+', '', match.group(1).strip())
+    sram_part = re.sub(r'\s+', '', match.group(2).strip())
+    return f"{from_part}/{sram_part}"
+
+
+def _search_page(text, patterns):
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return _format_match(match)
+    return None
+
+
+class BOMMemoryCache:
+    """
+    Memory info extracted from BOM PDFs, keyed by path+size+mtime and persisted
+    under the app data dir. Also remembers the page the last A05B-2600 line was
+    on and checks that page first in the next PDF.
+    """
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path or os.path.join(get_app_data_path(), "cache", CACHE_FILE)
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.page_hint = None
+        self.stats = {"hits": 0, "misses": 0, "pages_parsed": 0}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._entries = data.get("entries", {})
+            self.page_hint = data.get("page_hint")
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            pass
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": self._entries, "page_hint": self.page_hint}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Error saving BOM memory cache: {e}")
+
+    def get_memory_info(self, pdf_file_path):
+        st = os.stat(pdf_file_path)
+        key = f"{os.path.abspath(pdf_file_path)}|{st.st_size}|{st.st_mtime}"
+        with self._lock:
+            if key in self._entries:
+                self.stats["hits"] += 1
+                return self._entries[key]["memory"]
+            self.stats["misses"] += 1
+
+        memory_info, page = self._extract(pdf_file_path)
+
+        with self._lock:
+            self._entries[key] = {"memory": memory_info, "page": page}
+            while len(self._entries) > MAX_CACHE_ENTRIES:
+                self._entries.pop(next(iter(self._entries)))
+            if page is not None:
+                self.page_hint = page
+            self._save()
+        return memory_info
+
+    def _extract(self, pdf_file_path):
+        """Returns (memory_info, page index of an A05B-2600 hit or None)"""
+        with open(pdf_file_path, 'rb') as file:
+            reader = PyPDF2.PdfReader(file)
+            page_count = len(reader.pages)
+            texts = {}
+
+            def page_text(page_num):
+                if page_num not in texts:
+                    texts[page_num] = reader.pages[page_num].extract_text() or ""
+                    self.stats["pages_parsed"] += 1
+                return texts[page_num]
+
+            # Hinted page first, accepting only the A05B-2600 memory line there;
+            # otherwise scan pages in order and stop at the first match
+            hint = self.page_hint
+            if hint is not None and 0 <= hint < page_count:
+                memory_info = _search_page(page_text(hint), _A05B_PATTERNS)
+                if memory_info:
+                    return memory_info, hint
+
+            for page_num in range(page_count):
+                text = page_text(page_num)
+                for pattern in _MEMORY_PATTERNS:
+                    match = pattern.search(text)
+                    if match:
+                        found_page = page_num if pattern in _A05B_PATTERNS else None
+                        return _format_match(match), found_page
+        return None, None
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_bom_memory_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = BOMMemoryCache()
+        return _cache
+
+
+def extract_memory_info(pdf_file_path):
+    """Memory info (e.g. 'FROM256MB/SRAM3MB') from a BOM PDF, or None"""
+    try:
+        if not os.path.exists(pdf_file_path):
+            print(f"PDF file not found: {pdf_file_path}")
+            return None
+        return get_bom_memory_cache().get_memory_info(pdf_file_path)
+    except Exception as e:
+        print(f"Error extracting memory from PDF: {str(e)}")
+        traceback.print_exc()
+        return None
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+from config import get_app_data_path
+
+CACHE_SUBDIR = "kconvars"
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+_ENTRY_EXTENSIONS = (".txt", ".json")
+
+
+class ConversionCache:
+    """
+    Converted sysmast text and extracted variables under the app data dir,
+    content-addressed by SHA-256 of the input file plus the converter version,
+    so an unchanged backup is never converted twice. Total size is bounded;
+    the least recently used entries are evicted first (hits refresh mtime).
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir or os.path.join(get_app_data_path(), "cache", CACHE_SUBDIR)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, digest, version, ext):
+        key = hashlib.sha256(f"{digest}|{version}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + ext)
+
+    def _hit(self, path):
+        with self._lock:
+            if not os.path.exists(path):
+                self.stats["misses"] += 1
+                return False
+            self.stats["hits"] += 1
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return True
+
+    def work_path(self, suffix=".txt"):
+        """Unique scratch path in the cache dir, ignored by eviction"""
+        return os.path.join(self.cache_dir, f"{os.urandom(8).hex()}{suffix}")
+
+    def get_text(self, digest, version):
+        """Path of the cached conversion or None"""
+        path = self._path(digest, version, ".txt")
+        return path if self._hit(path) else None
+
+    def put_text(self, digest, version, source_path):
+        """Move a finished conversion into the cache; returns its cached path"""
+        path = self._path(digest, version, ".txt")
+        try:
+            os.replace(source_path, path)
+        except OSError:
+            shutil.move(source_path, path)  # e.g. kconvars wrote to another drive
+        self._evict(keep=path)
+        return path
+
+    def get_values(self, digest, version):
+        path = self._path(digest, version, ".json")
+        if not self._hit(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def put_values(self, digest, version, values: dict):
+        path = self._path(digest, version, ".json")
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(values, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error saving conversion cache entry: {e}")
+            return
+        self._evict(keep=path)
+
+    def _evict(self, keep=None):
+        """Drop least recently used entries until under max_bytes; never the one just written"""
+        with self._lock:
+            entries = []
+            total = 0
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    stem, ext = os.path.splitext(entry.name)
+                    # Only cache entries (64-hex keys); scratch files are left alone
+                    if ext not in _ENTRY_EXTENSIONS or len(stem) != 64:
+                        continue
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+            if total <= self.max_bytes:
+                return
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                    self.stats["evictions"] += 1
+                except OSError:
+                    pass
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_conversion_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ConversionCache()
+        return _cache
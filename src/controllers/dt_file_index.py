@@ -0,0 +1,69 @@
+import os
+import re
+import threading
+
+from controllers.wo_file_index import DirectoryIndex
+
+DT_BASE_PATH = r"\\fanuc\FS\Corporate\Products\Data_Sheets_MD"
+DT_EXTENSIONS = (".xls", ".xlsx", ".xlsm")
+
+_e_number_in_name = re.compile(r"E-?(\d{6})", re.IGNORECASE)
+
+
+def normalize_e_number(e_number):
+    """'e-123456' / '123456' / 'E123456' -> 'E123456'"""
+    clean_e_number = e_number.strip().upper()
+    if clean_e_number.startswith("E-"):
+        clean_e_number = "E" + clean_e_number[2:]
+    elif not clean_e_number.startswith("E"):
+        clean_e_number = "E" + clean_e_number
+    return clean_e_number
+
+
+class DTFileIndex(DirectoryIndex):
+    """Index of normalized E-number -> files in one Data_Sheets_MD folder"""
+
+    cache_prefix = "dt_index"
+
+    def keys_for(self, name):
+        return {f"E{digits}" for digits in _e_number_in_name.findall(name)}
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _get_index(directory):
+    with _indexes_lock:
+        index = _indexes.get(directory)
+        if index is None:
+            index = DTFileIndex(directory)
+            _indexes[directory] = index
+        return index
+
+
+def find_dt_files(e_number):
+    """
+    Look up DT files for an E-number in its range folder and its DT subfolder.
+    Returns (excel_files, other_files) with DT subfolder hits first, or raises
+    ValueError for a malformed E-number.
+    """
+    clean_e_number = normalize_e_number(e_number)
+    match = re.match(r'E(\d{3})(\d{3})', clean_e_number)
+    if not match:
+        raise ValueError(f"Invalid E-number format: {e_number}")
+    key = clean_e_number[:7]
+    range_folder = f"E{match.group(1)}000-E{match.group(1)}999"
+    regular_path = os.path.join(DT_BASE_PATH, range_folder)
+    dt_path = os.path.join(regular_path, "DT")
+
+    excel_files = []
+    other_files = []
+    # Indexes are built lazily, once per folder
+    for directory in (dt_path, regular_path):
+        for path in _get_index(directory).lookup_paths(key):
+            if path.lower().endswith(DT_EXTENSIONS):
+                excel_files.append(path)
+            else:
+                other_files.append(path)
+    return excel_files, other_files
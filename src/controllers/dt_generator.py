@@ -1,14 +1,17 @@
 import os
 import subprocess
-import re
-import glob
-import openpyxl
-import xlrd
-import xlwt
-from xlutils.copy import copy as xl_copy
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 import sys
 
-\
+from controllers import sv_reader
+from controllers.conversion_cache import get_conversion_cache
+from controllers.file_transfer import file_sha256
+from controllers.kconvars_text import extract_fields_from_file
+from controllers.dt_workbook import ENGINE_AUTO, WORKBOOK_ENGINES, WorkbookSession
+
+
 if getattr(sys, 'frozen', False):
     BASE_DIR = os.path.dirname(sys.executable)
 else:
@@ -18,116 +21,292 @@ KCONVARS_PATH = os.path.abspath(KCONVARS_PATH)
 
 DT_TARGET_DIR = r"J:\SC\SC_ALL\European Customisation Center\2.Robotics\ECC Internal\19_Data_Sheets_new"
 
+MASTER_COUNT_FIELD = "$DMR_GRP[1].$MASTER_COUN"
+MASTER_COUNT_CELLS = 9  # F22..F30
+BATCH_CONVERT_WORKERS = 4  # jobs read at once (each may spawn kconvars)
+
+NATIVE_READER_VERSION = f"sv_reader/{sv_reader.READER_VERSION}"
+_kconvars_version = (None, None)  # ((size, mtime) of kconvars.exe, version string)
+
+
+def find_backup_folder(source, wo_number, e_number):
+    """Backup folder for the WO: source may be the USB root or the folder itself"""
+    folder_name = f"{wo_number}_{e_number}"
+    if os.path.basename(os.path.normpath(source)) == folder_name:
+        return source
+    return os.path.join(source, folder_name)
+
+
+def _kconvars_env():
+    # portable PATH
+    portable_dirs = [
+        os.path.join(BASE_DIR, "utils", "WinOLPC", "bin"),
+        os.path.join(BASE_DIR, "utils", "ROBOGUIDE", "bin"),
+        os.path.join(BASE_DIR, "utils", "Shared", "Utilities"),
+    ]
+    env = os.environ.copy()
+    env["PATH"] = os.pathsep.join([os.path.abspath(p) for p in portable_dirs]) + os.pathsep + env.get("PATH", "")
+    return env
+
+
+def _run_kconvars(sv_path, txt_path):
+    proc = subprocess.run(
+        [KCONVARS_PATH, sv_path, txt_path],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(KCONVARS_PATH),
+        creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0),
+        env=_kconvars_env()
+    )
+    if os.path.exists(txt_path):
+        return txt_path, None
+    alt_out_path = os.path.join(os.path.dirname(KCONVARS_PATH), os.path.basename(txt_path))
+    if os.path.exists(alt_out_path):
+        return alt_out_path, None
+    return None, f"Failed to convert sysmast.sv: {proc.stderr or proc.stdout or 'No txt file created.'}"
+
+
+def kconvars_version():
+    """Converter version for cache keys: hash of kconvars.exe, recomputed only when it changes"""
+    global _kconvars_version
+    st = os.stat(KCONVARS_PATH)
+    stamp = (st.st_size, st.st_mtime)
+    if _kconvars_version[0] != stamp:
+        _kconvars_version = (stamp, f"kconvars/{file_sha256(KCONVARS_PATH)}")
+    return _kconvars_version[1]
+
+
+def convert_sysmast(sv_path, digest=None):
+    """
+    Convert sysmast.sv with kconvars into the local conversion cache (nothing is
+    written to the USB drive); returns (txt_path, error). An unchanged file with
+    the same kconvars is converted only once.
+    """
+    try:
+        if not os.path.isfile(KCONVARS_PATH):
+            return None, f"kconvars.exe not found! Expected path: {KCONVARS_PATH}"
+        digest = digest or file_sha256(sv_path)
+        version = kconvars_version()
+        cache = get_conversion_cache()
+        cached = cache.get_text(digest, version)
+        if cached:
+            return cached, None
+        # Unique output name, so parallel jobs can't collide even when kconvars
+        # writes into its own folder instead of the given path
+        txt_path, error = _run_kconvars(sv_path, cache.work_path())
+        if error:
+            return None, error
+        return cache.put_text(digest, version, txt_path), None
+    except Exception as ex:
+        return None, f"Error running kconvars: {ex}"
+
+
+def extract_master_counts(txt_path):
+    """The 9 $DMR_GRP[1].$MASTER_COUN values from a kconvars dump; returns (values, error)"""
+    try:
+        arr_values = extract_fields_from_file(txt_path, [MASTER_COUNT_FIELD]).get(MASTER_COUNT_FIELD, [])
+        if len(arr_values) != MASTER_COUNT_CELLS:
+            return None, f"$MASTER_COUN values not found in {txt_path}"
+        return arr_values, None
+    except Exception as ex:
+        return None, f"Error reading txt: {ex}"
+
+
+def read_master_counts(sv_path):
+    """
+    $MASTER_COUN values read natively from sysmast.sv, or via kconvars if that
+    fails; returns (values, error). Results are cached by file content.
+    """
+    try:
+        digest = file_sha256(sv_path)
+    except OSError as ex:
+        return None, f"Error reading sysmast.sv: {ex}"
+    cache = get_conversion_cache()
+    versions = [NATIVE_READER_VERSION]
+    if os.path.isfile(KCONVARS_PATH):
+        # Computed (and memoized) here too, so kconvars results cached before a restart are found
+        versions.append(kconvars_version())
+    for version in versions:
+        cached = cache.get_values(digest, version)
+        if cached and len(cached.get("master_counts", [])) == MASTER_COUNT_CELLS:
+            return cached["master_counts"], None
+
+    try:
+        values = sv_reader.read_master_counts(sv_path)
+        if len(values) == MASTER_COUNT_CELLS:
+            cache.put_values(digest, NATIVE_READER_VERSION, {"master_counts": values})
+            return values, None
+        print(f"Unexpected $MASTER_COUN size in {sv_path}: {len(values)}, using kconvars")
+    except Exception as ex:
+        print(f"Native sysmast.sv read failed, using kconvars: {ex}")
+    txt_path, error = convert_sysmast(sv_path, digest)
+    if error:
+        return None, error
+    values, error = extract_master_counts(txt_path)
+    if values:
+        cache.put_values(digest, kconvars_version(), {"master_counts": values})
+    return values, error
+
+
+def find_dt_path(e_number, ro_tools=None):
+    """DT template for the E-number; returns (path, error)"""
+    try:
+        if ro_tools is not None:
+            found, msg = ro_tools.find_dt_file_path(e_number)
+        else:
+            from controllers.dt_file_index import find_dt_files
+            try:
+                excel_files, _ = find_dt_files(e_number)
+                found, msg = bool(excel_files), excel_files[0] if excel_files else f"No DT file found for {e_number}"
+            except ValueError as e:
+                found, msg = False, str(e)
+        if not found or not msg:
+            return None, f"DT file not found for {e_number}: {msg}"
+        return msg, None
+    except Exception as ex:
+        return None, f"Error finding DT file: {ex}"
+
+
 class DTGenerator:
     def __init__(self, config):
         self.config = config
 
-    def generate_dt(self, wo_number, e_number, usb_path, ro_tools, snack_bar=None):
-
-        # Find the folder on the USB drive
+    @property
+    def workbook_engine(self):
+        if self.config is None:
+            return ENGINE_AUTO
+        return self.config.get_dt_settings().get("workbook_engine", ENGINE_AUTO)
 
-        folder_name = f"{wo_number}_{e_number}"
-        folder_path = os.path.join(usb_path, folder_name)
+    def prepare_job(self, wo_number, e_number, source):
+        """Find sysmast.sv and read the $MASTER_COUN values; returns (values, error)"""
+        folder_path = find_backup_folder(source, wo_number, e_number)
         if not os.path.exists(folder_path):
-            return False, f"Folder not found: {folder_path}"
-        
-        # Find sysmast.sv
+            return None, f"Folder not found: {folder_path}"
 
         sv_path = os.path.join(folder_path, "sysmast.sv")
         if not os.path.exists(sv_path):
-            return False, f"sysmast.sv not found in {folder_path}"
-        
-        # Convert sv to txt
-        txt_path = os.path.splitext(sv_path)[0] + ".txt"
-        try:
-            if not os.path.isfile(KCONVARS_PATH):
-                return False, f"kconvars.exe not found! Expected path: {KCONVARS_PATH}"
-            command = [KCONVARS_PATH, sv_path, txt_path]
-            # portable PATH
-            portable_dirs = [
-                os.path.join(BASE_DIR, "utils", "WinOLPC", "bin"),
-                os.path.join(BASE_DIR, "utils", "ROBOGUIDE", "bin"),
-                os.path.join(BASE_DIR, "utils", "Shared", "Utilities"),
-            ]
-            env = os.environ.copy()
-            env["PATH"] = os.pathsep.join([os.path.abspath(p) for p in portable_dirs]) + os.pathsep + env.get("PATH", "")
-            proc = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                cwd=os.path.dirname(KCONVARS_PATH),
-                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0),
-                env=env
-            )
-            if os.path.exists(txt_path):
-                pass
-            else:
-                alt_out_path = os.path.join(os.path.dirname(KCONVARS_PATH), os.path.basename(txt_path))
-                if os.path.exists(alt_out_path):
-                    txt_path = alt_out_path
-                else:
-                    return False, f"Failed to convert sysmast.sv: {proc.stderr or proc.stdout or 'No txt file created.'}"
-        except Exception as ex:
-            return False, f"Error running kconvars: {ex}"
-        
-        # Extract array from txt
+            return None, f"sysmast.sv not found in {folder_path}"
 
-        try:
-            with open(txt_path, encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
-            arr_values = []
-            arr_start = False
-            for i, line in enumerate(lines):
-                if "Field: $DMR_GRP[1].$MASTER_COUN" in line:
-                    arr_start = True
-                    
-                    for j in range(1, 10):
-                        if i + j < len(lines):
-                            match = re.search(r"\[\d+\]\s*=\s*(-?\d+)", lines[i + j])
-                            if match:
-                                arr_values.append(int(match.group(1)))
-                    break
-            if len(arr_values) != 9:
-                return False, 
-        except Exception as ex:
-            return False, f"Error reading txt: {ex}"
-        
-        # Find DT file via ro_tools
+        return read_master_counts(sv_path)
 
-        dt_path = None
-        try:
-            found, msg = ro_tools.find_dt_file_path(e_number)
-            if not found or not msg:
-                return False, f"DT file not found for {e_number}: {msg}"
-            dt_path = msg
-        except Exception as ex:
-            return False, f"Error finding DT file: {ex}"
-        
-        # Open DT file, replace values, save to target folder
+    def generate_dt(self, wo_number, e_number, usb_path, ro_tools, snack_bar=None):
+        values, error = self.prepare_job(wo_number, e_number, usb_path)
+        if error:
+            return False, error
+
+        dt_path, error = find_dt_path(e_number, ro_tools)
+        if error:
+            return False, error
 
+        # Open DT file, replace values, save to target folder
         try:
-            import win32com.client
-            base_name = os.path.basename(dt_path)
-            save_path = os.path.join(DT_TARGET_DIR, base_name)
-            # Remove the file if it already exists to avoid Excel dialog
-            if os.path.exists(save_path):
-                try:
-                    os.remove(save_path)
-                except Exception as ex:
-                    return False, f"Failed to remove existing file: {save_path}. Error: {ex}"
-            excel = win32com.client.Dispatch("Excel.Application")
-            excel.Visible = False
-            excel.DisplayAlerts = False  # Disable Excel alerts
-            wb = excel.Workbooks.Open(dt_path)
-            ws = wb.Worksheets(1)  # First sheet
-            for idx, val in enumerate(arr_values):
-                ws.Range(f"F{22+idx}").Value = val
-            wb.SaveAs(save_path)
-            wb.Close(False)
-            excel.Quit()
+            with WorkbookSession(self.workbook_engine) as session:
+                save_path = session.write_dt(dt_path, values, DT_TARGET_DIR)
             # Open the ready file in Excel
             os.startfile(save_path)
         except Exception as ex:
-            return False, f"Error editing/saving Excel via COM: {ex}"
+            return False, f"Error editing/saving DT workbook: {ex}"
         return True, f"DT file updated and saved to {save_path} (opened in Excel)"
 
+    def generate_batch(self, jobs, ro_tools=None, max_workers=BATCH_CONVERT_WORKERS, target_dir=DT_TARGET_DIR,
+                       engine=None):
+        """
+        Generate DTs for many (wo_number, e_number, source) jobs in one pass.
+        sysmast.sv is read for up to max_workers jobs at a time; all workbooks are
+        written through one workbook session. Returns one report dict per job, in
+        input order: wo_number, e_number, source, success, message, output, seconds.
+        """
+        jobs = list(jobs)
+        report = [
+            {"wo_number": wo, "e_number": e, "source": src, "success": False,
+             "message": "", "output": None, "seconds": 0.0}
+            for wo, e, src in jobs
+        ]
+        started = [time.perf_counter()] * len(jobs)
+
+        def prepare(index):
+            wo, e, src = jobs[index]
+            started[index] = time.perf_counter()
+            values, error = self.prepare_job(wo, e, src)
+            if error is None:
+                dt_path, error = find_dt_path(e, ro_tools)
+                return values, dt_path, error
+            return values, None, error
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="dt-batch") as executor, \
+                WorkbookSession(engine or self.workbook_engine) as session:
+            futures = [executor.submit(prepare, i) for i in range(len(jobs))]
+            # Workbooks are written on this thread as conversions finish, in job order
+            for i, future in enumerate(futures):
+                entry = report[i]
+                try:
+                    values, dt_path, error = future.result()
+                    if error:
+                        entry["message"] = error
+                    else:
+                        entry["output"] = session.write_dt(dt_path, values, target_dir)
+                        entry["success"] = True
+                        entry["message"] = f"DT file saved to {entry['output']}"
+                except Exception as ex:
+                    entry["message"] = f"Error generating DT: {ex}"
+                entry["seconds"] = round(time.perf_counter() - started[i], 3)
+        return report
+
+
+def _read_jobs_file(path):
+    """Jobs from a JSON list of [wo, e, source] / {"wo_number", "e_number", "source"}, or CSV lines"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if path.lower().endswith(".json"):
+        jobs = []
+        for item in json.loads(text):
+            if isinstance(item, dict):
+                jobs.append((item["wo_number"], item["e_number"], item["source"]))
+            else:
+                jobs.append(tuple(item))
+        return jobs
+    jobs = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            wo, e, src = [part.strip() for part in line.split(",", 2)]
+            jobs.append((wo, e, src))
+    return jobs
+
+
+def main(argv=None):
+    """Headless batch entry point: python -m controllers.dt_generator --job WO,E-NUMBER,SOURCE ..."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate DT files for several WOs in one pass")
+    parser.add_argument("--job", action="append", default=[], metavar="WO,E-NUMBER,SOURCE",
+                        help="one job; SOURCE is a USB root or the WO backup folder")
+    parser.add_argument("--jobs-file", help="CSV (wo,e_number,source per line) or JSON jobs file")
+    parser.add_argument("--workers", type=int, default=BATCH_CONVERT_WORKERS, help="concurrent kconvars conversions")
+    parser.add_argument("--target-dir", default=DT_TARGET_DIR, help="folder the DT files are saved to")
+    parser.add_argument("--engine", choices=WORKBOOK_ENGINES, default=ENGINE_AUTO,
+                        help="workbook writer: auto (openpyxl/xlutils) or com (Excel)")
+    parser.add_argument("--report", help="write the per-job report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    jobs = [tuple(part.strip() for part in job.split(",", 2)) for job in args.job]
+    if args.jobs_file:
+        jobs.extend(_read_jobs_file(args.jobs_file))
+    if not jobs or any(len(job) != 3 for job in jobs):
+        parser.error("at least one WO,E-NUMBER,SOURCE job is required")
+
+    report = DTGenerator(None).generate_batch(
+        jobs, max_workers=args.workers, target_dir=args.target_dir, engine=args.engine
+    )
+    for entry in report:
+        status = "OK  " if entry["success"] else "FAIL"
+        print(f"{status} {entry['wo_number']} {entry['e_number']} ({entry['seconds']:.1f}s): {entry['message']}")
+    ok = sum(1 for entry in report if entry["success"])
+    print(f"{ok}/{len(report)} DT files generated")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if ok == len(report) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+import importlib.util
+import os
+import struct
+import zipfile
+
+import openpyxl
+import xlrd
+from xlrd import compdoc
+from xlutils.copy import copy as xl_copy
+
+# DT value cells: column F, rows 22.. on the first sheet
+DT_VALUE_COLUMN = 6
+DT_FIRST_ROW = 22
+
+ENGINE_AUTO = "auto"  # openpyxl for .xlsx/.xlsm, xlrd+xlutils for .xls; COM for what those would lose
+ENGINE_COM = "com"    # Excel via COM for every file (Windows with Excel only)
+WORKBOOK_ENGINES = (ENGINE_AUTO, ENGINE_COM)
+
+# What a headless writer would lose from a template
+LOST_DRAWINGS = "images/charts/shapes"
+LOST_FORMULAS = "formulas"
+
+# Parts/records of images, charts and shapes, which the headless writers drop
+_XLSX_DRAWING_PARTS = ("xl/drawings/", "xl/charts/", "xl/media/", "xl/embeddings/")
+_XLS_DRAWING_RECORDS = {
+    0x005D,  # OBJ
+    0x007F,  # IMDATA
+    0x00E9,  # BITMAP (sheet background)
+    0x00EB,  # MSODRAWINGGROUP
+    0x00EC,  # MSODRAWING
+}
+# Formula records, which xlrd + xlutils turn into their cached values
+_XLS_FORMULA_RECORDS = {
+    0x0006,  # FORMULA
+    0x0221,  # ARRAY
+    0x04BC,  # SHRFMLA
+}
+
+
+def _com_available():
+    return importlib.util.find_spec("win32com") is not None
+
+
+def _prepare_target(dt_path, target_dir):
+    save_path = os.path.join(target_dir, os.path.basename(dt_path))
+    # Remove the file if it already exists to avoid Excel dialog / stale output
+    if os.path.exists(save_path):
+        try:
+            os.remove(save_path)
+        except Exception as ex:
+            raise RuntimeError(f"Failed to remove existing file: {save_path}. Error: {ex}")
+    return save_path
+
+
+class OpenpyxlWriter:
+    """
+    .xlsx/.xlsm in-process; styles, formulas and (for .xlsm) macros are kept.
+    Images, charts and shapes are not: openpyxl drops drawings it can't
+    round-trip, so templates with drawings go to ComWriter under auto.
+    """
+
+    extensions = (".xlsx", ".xlsm")
+
+    @staticmethod
+    def lost_content(dt_path):
+        """What of the template this writer would lose: a set of LOST_* values"""
+        with zipfile.ZipFile(dt_path) as zf:
+            if any(name.startswith(_XLSX_DRAWING_PARTS) for name in zf.namelist()):
+                return {LOST_DRAWINGS}
+        return set()
+
+    def write(self, dt_path, values, save_path):
+        keep_vba = dt_path.lower().endswith(".xlsm")
+        wb = openpyxl.load_workbook(dt_path, keep_vba=keep_vba)
+        try:
+            ws = wb.worksheets[0]  # First sheet
+            for idx, val in enumerate(values):
+                ws.cell(row=DT_FIRST_ROW + idx, column=DT_VALUE_COLUMN).value = val
+            tmp_path = save_path + ".tmp"
+            wb.save(tmp_path)
+        finally:
+            wb.close()
+        os.replace(tmp_path, save_path)
+
+    def close(self):
+        pass
+
+
+class XlsWriter:
+    """
+    .xls in-process via xlrd + xlutils. Cell formats are carried over by
+    re-applying each written cell's original XF index. xlrd only reads cached
+    formula results, so formulas would be saved as stale values, and images,
+    charts and shapes are dropped; templates with either go to ComWriter
+    under auto.
+
+    Restoring the XF index goes through xlwt's private row/cell attributes;
+    xlwt and xlutils are pinned in requirements.txt for that reason.
+    """
+
+    extensions = (".xls",)
+
+    @staticmethod
+    def lost_content(dt_path):
+        """What of the template this writer would lose: a set of LOST_* values"""
+        with open(dt_path, "rb") as f, open(os.devnull, "w") as devnull:
+            doc = compdoc.CompDoc(f.read(), logfile=devnull)
+        for name in ("Workbook", "Book"):
+            mem, base, size = doc.locate_named_stream(name)
+            if mem is not None:
+                break
+        else:
+            return set()
+        lost = set()
+        pos, end = base, base + size
+        while pos + 4 <= end:
+            record, length = struct.unpack_from("<HH", mem, pos)
+            if record in _XLS_DRAWING_RECORDS:
+                lost.add(LOST_DRAWINGS)
+            elif record in _XLS_FORMULA_RECORDS:
+                lost.add(LOST_FORMULAS)
+            pos += 4 + length
+        return lost
+
+    def write(self, dt_path, values, save_path):
+        rb = xlrd.open_workbook(dt_path, formatting_info=True)
+        wb = xl_copy(rb)
+        ws = wb.get_sheet(0)  # First sheet
+        for idx, val in enumerate(values):
+            row, col = DT_FIRST_ROW - 1 + idx, DT_VALUE_COLUMN - 1
+            old_row = ws._Worksheet__rows.get(row)
+            old_cell = old_row._Row__cells.get(col) if old_row else None
+            ws.write(row, col, val)
+            if old_cell is not None:
+                # ws.write() resets the style; restore the template's
+                ws._Worksheet__rows[row]._Row__cells[col].xf_idx = old_cell.xf_idx
+        tmp_path = save_path + ".tmp"
+        wb.save(tmp_path)
+        rb.release_resources()
+        os.replace(tmp_path, save_path)
+
+    def close(self):
+        pass
+
+
+class ComWriter:
+    """Any Excel format through one Excel.Application kept for the whole session"""
+
+    extensions = (".xls", ".xlsx", ".xlsm")
+
+    def __init__(self):
+        self.excel = None
+
+    def _app(self):
+        if self.excel is None:
+            import win32com.client
+            self.excel = win32com.client.Dispatch("Excel.Application")
+            self.excel.Visible = False
+            self.excel.DisplayAlerts = False  # Disable Excel alerts
+        return self.excel
+
+    def write(self, dt_path, values, save_path):
+        wb = self._app().Workbooks.Open(dt_path)
+        try:
+            ws = wb.Worksheets(1)  # First sheet
+            for idx, val in enumerate(values):
+                ws.Cells(DT_FIRST_ROW + idx, DT_VALUE_COLUMN).Value = val
+            wb.SaveAs(save_path)
+        finally:
+            wb.Close(False)
+
+    def close(self):
+        if self.excel is not None:
+            try:
+                self.excel.Quit()
+            except Exception as ex:
+                print(f"Error closing Excel: {ex}")
+            self.excel = None
+
+
+class WorkbookSession:
+    """
+    Writes DT workbooks with the writer for each file's extension. Writers are
+    created on first use and kept until close(), so a batch starts Excel (COM
+    engine) at most once.
+    """
+
+    def __init__(self, engine=ENGINE_AUTO):
+        if engine not in WORKBOOK_ENGINES:
+            raise ValueError(f"Unknown workbook engine: {engine}")
+        self.engine = engine
+        self._writers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _writer_for(self, dt_path):
+        if self.engine == ENGINE_COM:
+            writer_class = ComWriter
+        else:
+            ext = os.path.splitext(dt_path)[1].lower()
+            writer_class = next((w for w in (OpenpyxlWriter, XlsWriter) if ext in w.extensions), None)
+            if writer_class is None:
+                raise ValueError(f"Unsupported DT file type: {ext}")
+            lost = writer_class.lost_content(dt_path)
+            if lost:
+                name = os.path.basename(dt_path)
+                if _com_available():
+                    writer_class = ComWriter
+                elif LOST_FORMULAS in lost:
+                    # Derived cells would silently keep the template's values
+                    raise RuntimeError(f"{name} has formulas that need Excel (COM) to recalculate")
+                else:
+                    print(f"{name} has images/charts/shapes that will be lost without Excel (COM)")
+        writer = self._writers.get(writer_class)
+        if writer is None:
+            writer = writer_class()
+            self._writers[writer_class] = writer
+        return writer
+
+    def write_dt(self, dt_path, values, target_dir):
+        """Copy the DT template to target_dir with values in F22.. of the first sheet; returns save path"""
+        writer = self._writer_for(dt_path)
+        save_path = _prepare_target(dt_path, target_dir)
+        writer.write(dt_path, values, save_path)
+        return save_path
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
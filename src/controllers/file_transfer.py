@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path, chunk_size=HASH_CHUNK_SIZE):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_file_atomic(target_path, data: bytes):
+    """
+    Write data to target_path via a temp file in the same directory, fsync it,
+    rename it over the target and verify the written file by SHA-256.
+    Returns (bytes_written, seconds). Raises IOError if verification fails;
+    the previous target file is left untouched on any failure before the rename.
+    """
+    start = time.perf_counter()
+    expected = hashlib.sha256(data).hexdigest()
+    target_dir = os.path.dirname(target_path) or '.'
+    temp_path = os.path.join(target_dir, f".{os.path.basename(target_path)}.tmp")
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, target_path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(target_dir)
+    if file_sha256(target_path) != expected:
+        raise IOError(f"Checksum mismatch after writing {target_path}")
+    return len(data), time.perf_counter() - start
+
+
+def _fsync_dir(path):
+    # Persist the rename itself; not supported on Windows, where it is a no-op
+    if os.name == 'nt':
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def format_throughput(num_bytes, seconds):
+    if seconds <= 0:
+        return f"{num_bytes / 1024:.1f} KB"
+    return f"{num_bytes / 1024:.1f} KB in {seconds * 1000:.0f} ms, {num_bytes / 1024 / 1024 / seconds:.2f} MB/s"
+
+
+COPY_BUFFER_SIZE = 4 * 1024 * 1024
+TRANSFER_WORKERS = 4
+PROGRESS_INTERVAL = 0.5  # seconds between progress callbacks
+RESUME_MARKER = ".ecdc_transfer.json"
+
+
+def read_resume_marker(dst_dir):
+    """Source path recorded by an interrupted move into dst_dir, or None"""
+    try:
+        with open(os.path.join(dst_dir, RESUME_MARKER), 'r', encoding='utf-8') as f:
+            return json.load(f).get("source")
+    except (OSError, ValueError):
+        return None
+
+
+class TransferEngine:
+    """
+    Moves folder trees with a bounded thread pool.
+
+    Every file is copied with large buffers to a .part file, renamed into place
+    and verified by size and SHA-256 before any source is deleted. A marker file
+    in the destination records the source, so an interrupted move can be resumed:
+    files already present with matching size and hash are not copied again.
+
+    progress_callback(done_bytes, total_bytes, bytes_per_second, eta_seconds)
+    is called from worker threads at most every PROGRESS_INTERVAL seconds.
+    """
+
+    def __init__(self, workers=TRANSFER_WORKERS, buffer_size=COPY_BUFFER_SIZE, progress_callback=None):
+        self.workers = workers
+        self.buffer_size = buffer_size
+        self.progress_callback = progress_callback
+        self._lock = threading.Lock()
+        self._done_bytes = 0
+        self._total_bytes = 0
+        self._start = 0.0
+        self._last_report = 0.0
+
+    def _plan(self, src_dir, dst_dir):
+        files = []
+        for root, dirs, names in os.walk(src_dir):
+            rel_root = os.path.relpath(root, src_dir)
+            target_root = os.path.normpath(os.path.join(dst_dir, rel_root))
+            os.makedirs(target_root, exist_ok=True)
+            for name in names:
+                src_path = os.path.join(root, name)
+                files.append((src_path, os.path.join(target_root, name), os.path.getsize(src_path)))
+        return files
+
+    def _advance(self, num_bytes, force=False):
+        with self._lock:
+            self._done_bytes += num_bytes
+            now = time.perf_counter()
+            if not self.progress_callback or (not force and now - self._last_report < PROGRESS_INTERVAL):
+                return
+            self._last_report = now
+            done, total = self._done_bytes, self._total_bytes
+            elapsed = now - self._start
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else None
+        try:
+            self.progress_callback(done, total, rate, eta)
+        except Exception as e:
+            print(f"Error in transfer progress callback: {e}")
+
+    def _copy_verified(self, src_path, dst_path, size):
+        # Resume: a complete, identical file is already in place
+        if os.path.exists(dst_path) and os.path.getsize(dst_path) == size:
+            if file_sha256(dst_path, self.buffer_size) == file_sha256(src_path, self.buffer_size):
+                self._advance(size)
+                return
+        part_path = dst_path + ".part"
+        digest = hashlib.sha256()
+        with open(src_path, 'rb') as src, open(part_path, 'wb') as dst:
+            while True:
+                chunk = src.read(self.buffer_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                dst.write(chunk)
+                self._advance(len(chunk))
+            dst.flush()
+            os.fsync(dst.fileno())
+        shutil.copystat(src_path, part_path)
+        os.replace(part_path, dst_path)
+        if os.path.getsize(dst_path) != size or file_sha256(dst_path, self.buffer_size) != digest.hexdigest():
+            raise IOError(f"Verification failed for {dst_path}")
+
+    def move_folders(self, jobs):
+        """
+        Move each (src_dir, dst_dir) job. Returns a list of (src_dir, dst_dir, error)
+        where error is None for folders that were verified and removed from the source.
+        """
+        self._start = time.perf_counter()
+        plans = []
+        for src_dir, dst_dir in jobs:
+            try:
+                os.makedirs(dst_dir, exist_ok=True)
+                with open(os.path.join(dst_dir, RESUME_MARKER), 'w', encoding='utf-8') as f:
+                    json.dump({"source": os.path.abspath(src_dir)}, f)
+                plans.append((src_dir, dst_dir, self._plan(src_dir, dst_dir), None))
+            except Exception as e:
+                plans.append((src_dir, dst_dir, [], e))
+        self._total_bytes = sum(size for _, _, files, _ in plans for _, _, size in files)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                [executor.submit(self._copy_verified, *file_task) for file_task in files]
+                for _, _, files, _ in plans
+            ]
+        self._advance(0, force=True)
+
+        results = []
+        for (src_dir, dst_dir, _, error), job_futures in zip(plans, futures):
+            if error is None:
+                error = next((f.exception() for f in job_futures if f.exception() is not None), None)
+            if error is None:
+                try:
+                    # Source goes first; the marker lets an interrupted delete resume
+                    shutil.rmtree(src_dir)
+                    os.remove(os.path.join(dst_dir, RESUME_MARKER))
+                except Exception as e:
+                    error = e
+            results.append((src_dir, dst_dir, error))
+        return results
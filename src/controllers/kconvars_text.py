@@ -0,0 +1,79 @@
+import re
+
+# Variable headers in kconvars text output:
+#   [*SYSTEM*]$LANGUAGE  Storage: CMOS  Access: RW  : STRING[13] = 'DEFAULT     '
+#   [*SYSTEM*]$DMR_GRP  Storage: SHADOW  Access: RW  : ARRAY[2] OF DMR_GRP_T
+#        Field: $DMR_GRP[1].$REF_DONE Access: RW: BOOLEAN = TRUE
+#        Field: $DMR_GRP[1].$MASTER_COUN  ARRAY[9] OF INTEGER
+#         [1] = -129992
+_HEADER = re.compile(r"^\s*(?:\[\*?\w+\*?\]|Field: )(\$[\w\[\].$]+)\s")
+_ARRAY = re.compile(r"ARRAY\[(\d+)\] OF (\w+)\s*$")
+_SCALAR = re.compile(r":\s*(\w+)(?:\[\d+\])?\s*=\s*(.*?)\s*$")
+_ELEMENT = re.compile(r"^\s*\[\d+\]\s*=\s*(.*?)\s*$")
+
+_INT_TYPES = ("INTEGER", "SHORT", "BYTE")
+# Element types of arrays whose values are listed as [i] = value lines
+_ELEMENT_TYPES = _INT_TYPES + ("REAL", "BOOLEAN", "STRING")
+
+
+def _convert(value, type_name):
+    if type_name in _INT_TYPES:
+        return int(value)
+    if type_name == "REAL":
+        return float(value)
+    if type_name == "BOOLEAN":
+        return value.upper() == "TRUE"
+    if value.startswith("'") and value.endswith("'"):
+        return value[1:-1]
+    return value
+
+
+def extract_fields(lines, names):
+    """
+    Pull the named variables/fields out of kconvars text in one pass.
+    lines is any line iterator (e.g. an open file); reading stops as soon as
+    every name is collected. Returns {name: value}, arrays as lists; names
+    not found are missing from the result. Arrays of structs (e.g. $DMR_GRP)
+    are not extractable as a whole and are left out; request their fields.
+    """
+    wanted = set(names)
+    found = {}
+    lines = iter(lines)
+    line = next(lines, None)
+    while line is not None:
+        match = _HEADER.match(line) if "$" in line else None
+        if not match or match.group(1) not in wanted:
+            line = next(lines, None)
+            continue
+        name, header = match.group(1), line
+        array = _ARRAY.search(header)
+        line = next(lines, None)
+        try:
+            if array:
+                size, type_name = int(array.group(1)), array.group(2)
+                if type_name in _ELEMENT_TYPES:
+                    values = []
+                    # Elements follow the header; the first other line is a
+                    # header again and is checked on the next round
+                    while line is not None and len(values) < size:
+                        element = _ELEMENT.match(line)
+                        if not element:
+                            break
+                        values.append(_convert(element.group(1), type_name))
+                        line = next(lines, None)
+                    found[name] = values
+            else:
+                scalar = _SCALAR.search(header)
+                if scalar:
+                    found[name] = _convert(scalar.group(2), scalar.group(1))
+        except ValueError:
+            print(f"Unexpected value format for {name}")
+        wanted.discard(name)
+        if not wanted:
+            break
+    return found
+
+
+def extract_fields_from_file(txt_path, names):
+    with open(txt_path, encoding="utf-8", errors="ignore") as f:
+        return extract_fields(f, names)
@@ -0,0 +1,102 @@
+import os
+import re
+from functools import lru_cache
+from types import MappingProxyType
+
+# Precompiled patterns for the orderfil .dat fields we use
+_E_NUMBER = re.compile(r'Robot F/E No\s*-\s*(E-?\d+|F\d+)', re.IGNORECASE)
+_CONFIG_MODEL = re.compile(r'([A-Z][0-9]+[A-Za-z0-9-/]+)')
+_LEADING_DASHES = re.compile(r'^[-\s]+')
+_MEM_DETAIL = re.compile(r'!SOF Ref8:', re.IGNORECASE)
+_SOF_REF = re.compile(r'(![Ss][Oo][Ff] [Rr]ef)\d+:')
+
+
+def decode_dat(content: bytes):
+    """Returns (text, encoding); latin1 decodes any byte sequence, so it is the only fallback needed"""
+    try:
+        return content.decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        return content.decode('latin1'), 'latin1'
+
+
+def _strip_ind_robot(model):
+    model = model.replace('IND.ROBOT', '').strip()
+    return _LEADING_DASHES.sub('', model)
+
+
+def parse_orderfil_text(text: str, encoding: str = 'utf-8') -> dict:
+    """
+    Scan orderfil text once and return:
+    encoding - encoding the text was decoded with (re-encoding lines gives the original bytes)
+    e_number, model, ref_line, config_line - robot identification
+    lines - tuple of lines with line endings kept
+    mem_detail_index - index of the '!SOF Ref8: ... Mem Detail' line or -1
+    sof_ref_index, sof_ref_format - first '!SOF RefN:' line and its spelling
+    """
+    e_number = None
+    model = None
+    ref_line = None
+    config_line = None
+    mem_detail_index = -1
+    sof_ref_index = -1
+    sof_ref_format = "!SOF Ref"
+
+    lines = tuple(text.splitlines(keepends=True))
+    for i, line in enumerate(lines):
+        # Identification stops at the first line where both values are known
+        if not (e_number and model):
+            if "!SOF Ref6:" in line and "Robot F/E No" in line:
+                ref_line = line.strip()
+                match = _E_NUMBER.search(ref_line)
+                if match:
+                    e_number = match.group(1)
+
+            if "!STARTING CONFIGURATION" in line and "IND.ROBOT" in line:
+                config_line = line.strip()
+                model = _strip_ind_robot(config_line)
+
+            if not model and "STARTING CONFIGURATION" in line:
+                config_line = line.strip()
+                match = _CONFIG_MODEL.search(config_line)
+                if match:
+                    model = match.group(1)
+
+        if mem_detail_index < 0 and "Mem Detail" in line and _MEM_DETAIL.search(line):
+            mem_detail_index = i
+
+        if sof_ref_index < 0:
+            sof_match = _SOF_REF.search(line)
+            if sof_match:
+                sof_ref_index = i
+                sof_ref_format = sof_match.group(1)
+
+    if model and 'IND.ROBOT' in model:
+        model = _strip_ind_robot(model)
+
+    return {
+        "encoding": encoding,
+        "e_number": e_number,
+        "model": model,
+        "ref_line": ref_line,
+        "config_line": config_line,
+        "lines": lines,
+        "mem_detail_index": mem_detail_index,
+        "sof_ref_index": sof_ref_index,
+        "sof_ref_format": sof_ref_format,
+    }
+
+
+@lru_cache(maxsize=64)
+def _parse_cached(path, size, mtime):
+    with open(path, 'rb') as f:
+        # Shared by every caller, so read-only (lines is already a tuple)
+        return MappingProxyType(parse_orderfil_text(*decode_dat(f.read())))
+
+
+def parse_orderfil(path: str):
+    """
+    Parse an orderfil .dat, at most once per (path, size, mtime). The record
+    is cached and shared: it is a read-only mapping; copy lines to edit them.
+    """
+    st = os.stat(path)
+    return _parse_cached(os.path.abspath(path), st.st_size, st.st_mtime)
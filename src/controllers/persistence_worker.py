@@ -0,0 +1,89 @@
+import threading
+import time
+
+DEFAULT_DEBOUNCE = 0.5  # seconds
+
+
+class PersistenceWorker:
+    """
+    Coalesces save requests and runs flush() on a background thread at most
+    once per debounce window (measured from the first pending request), so UI
+    handlers never wait for disk I/O. flush_now() writes synchronously, e.g. on
+    exit. The thread exits when idle and is restarted by the next request.
+    """
+
+    def __init__(self, flush, debounce=DEFAULT_DEBOUNCE):
+        self.flush = flush
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pending_since = None
+        self._stopped = False
+        self.stats = {"mutations": 0, "writes": 0, "errors": 0}
+
+    def request(self):
+        """Note a mutation; it is written within the debounce window"""
+        with self._lock:
+            self.stats["mutations"] += 1
+            if self._stopped:
+                return
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            if self._thread is None or not self._thread.is_alive():
+                self._wake.clear()
+                self._thread = threading.Thread(target=self._run, name="state-persistence", daemon=True)
+                self._thread.start()
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.debounce * 4)
+            with self._lock:
+                self._wake.clear()
+                since = self._pending_since
+                if since is None:
+                    self._thread = None  # idle, exit until the next request
+                    return
+            delay = since + self.debounce - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            with self._lock:
+                if self._pending_since is None:
+                    continue  # flushed synchronously meanwhile
+                self._pending_since = None
+            self._do_flush()
+
+    def _do_flush(self):
+        with self._flush_lock:
+            try:
+                self.flush()
+                with self._lock:
+                    self.stats["writes"] += 1
+            except Exception as e:
+                print(f"Error persisting state: {e}")
+                with self._lock:
+                    self.stats["errors"] += 1
+
+    def flush_now(self):
+        """Write pending changes on the calling thread"""
+        with self._lock:
+            self._pending_since = None
+        self._do_flush()
+
+    def stop(self):
+        """Final synchronous flush; later requests are only counted"""
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+            self._wake.set()
+        self.flush_now()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats["writes_saved"] = max(0, stats["mutations"] - stats["writes"])
+        return stats
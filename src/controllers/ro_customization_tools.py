@@ -1,12 +1,13 @@
 import os
 import re
 import subprocess
-import time
-import threading
 import traceback
-import glob
-import shutil 
-import PyPDF2
+from controllers.wo_file_index import SW_ORDER_DIR, get_wo_file_index
+from controllers.dt_file_index import find_dt_files
+from controllers.orderfil_parser import parse_orderfil
+from controllers.bom_memory import extract_memory_info
+from controllers.usb_monitor import get_usb_monitor
+from controllers.file_transfer import TransferEngine, read_resume_marker, write_file_atomic, format_throughput
 
 
 
@@ -14,8 +15,10 @@ class ROCustomizationController:
     def __init__(self, config):
         self.config = config
         self.usb_detection_callbacks = []
-        self.usb_detection_active = False
-        self.usb_thread = None
+
+    def get_wo_search_dir(self):
+        """SW order-file share used by every WO file lookup"""
+        return self.config.get_customization_settings().get("search_directory") or SW_ORDER_DIR
 
     def search_wo_files(self, wo_number: str):
         
@@ -23,19 +26,13 @@ class ROCustomizationController:
         if not re.match(r"^\d{8}$", wo_number):
             return {"error": "WO number must be an 8-digit number"}
 
-        search_dir = self.config.get_customization_settings().get("search_directory", "")
+        search_dir = self.get_wo_search_dir()
         if not os.path.isdir(search_dir):
             return {"error": f"Directory not found: {search_dir}"}
 
-        found_dat = None
-        found_pdf = None
-        for filename in os.listdir(search_dir):
-            if wo_number in filename:
-                full_path = os.path.join(search_dir, filename)
-                if filename.endswith(".dat"):
-                    found_dat = full_path
-                elif filename.endswith(".pdf"):
-                    found_pdf = full_path
+        files = get_wo_file_index(search_dir).lookup(wo_number)
+        found_dat = files["dat"][-1] if files["dat"] else None
+        found_pdf = files["pdf"][-1] if files["pdf"] else None
         
         if not found_dat and not found_pdf:
             return {"error": f"No .dat or .pdf found for {wo_number}"}
@@ -57,60 +54,15 @@ class ROCustomizationController:
         ref_line = None
         config_line = None
         
-        # Try reading the file in binary mode first to handle any encoding
         try:
-            with open(dat_file_path, 'rb') as f:
-                # Try to detect encoding or use a fallback
-                content = f.read()
-                encodings = ['utf-8', 'latin1', 'iso-8859-1', 'cp1252', 'windows-1252']
-                file_lines = None
-                
-                # Try different encodings
-                for encoding in encodings:
-                    try:
-                        file_lines = content.decode(encoding).splitlines()
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                
-                # If we couldn't decode with any encoding, use latin1 which can decode any byte
-                if file_lines is None:
-                    file_lines = content.decode('latin1', errors='replace').splitlines()
-                
-                # Iterate through lines to extract E-number and model
-                for line in file_lines:
-                    if "!SOF Ref6:" in line and "Robot F/E No" in line:
-                        ref_line = line.strip()
-                        match = re.search(r'Robot F/E No\s*-\s*(E-?\d+|F\d+)', ref_line, re.IGNORECASE)
-                        if match:
-                            e_number = match.group(1)
-                    
-                    if "!STARTING CONFIGURATION" in line and "IND.ROBOT" in line:
-                        config_line = line.strip()
-                        match = re.search(r'IND\.ROBOT\s+([A-Z0-9]+(?:[A-Z0-9-/]*[A-Z0-9]+)?)', config_line, re.IGNORECASE)
-                        if match:
-                            model = match.group(1)
-                        # Remove 'IND.ROBOT' from model name if present
-                        model = config_line.replace('IND.ROBOT', '').strip()
-                        # Remove extra spaces and dashes if any
-                        model = re.sub(r'^[-\s]+', '', model)
-                    
-                    if not model and "STARTING CONFIGURATION" in line:
-                        config_line = line.strip()
-                        match = re.search(r'([A-Z][0-9]+[A-Za-z0-9-/]+)', config_line)
-                        if match:
-                            model = match.group(1)
-                    
-                    if e_number and model:
-                        break
+            record = parse_orderfil(dat_file_path)
+            e_number = record["e_number"]
+            model = record["model"]
+            ref_line = record["ref_line"]
+            config_line = record["config_line"]
         except Exception as e:
             print(f"Error parsing file data: {e}")
         
-        # If model still contains 'IND.ROBOT', remove it (fallback)
-        if model and 'IND.ROBOT' in model:
-            model = model.replace('IND.ROBOT', '').strip()
-            model = re.sub(r'^[-\s]+', '', model)
-        
         return {
             "e_number": e_number,
             "model": model,
@@ -133,7 +85,9 @@ class ROCustomizationController:
             print(f"Error opening file: {e}")
             return False
 
-    def get_connected_usb_drives(self):
+    @staticmethod
+    def get_connected_usb_drives():
+        # Static, so the shared USB monitor holds a plain function, not a controller
         drives = []
         
         try:
@@ -167,7 +121,7 @@ class ROCustomizationController:
                             # If it's a removable drive
                             if drive_type == DRIVE_REMOVABLE:
                                 # Add extra validation to confirm it's a real USB drive
-                                if self._is_physical_usb_drive(drive_path):
+                                if ROCustomizationController._is_physical_usb_drive(drive_path):
                                     try:
                                         # Define constants and structures for GetVolumeInformation
                                         buffer_len = 256
@@ -248,7 +202,8 @@ class ROCustomizationController:
         
         return drives
 
-    def _is_physical_usb_drive(self, drive_path):
+    @staticmethod
+    def _is_physical_usb_drive(drive_path):
         """Check if a drive is a physical USB drive by verifying it has typical USB drive characteristics"""
         try:
             # Check if the drive actually exists and is accessible
@@ -274,61 +229,15 @@ class ROCustomizationController:
         return None
         
     def register_usb_detection_callback(self, callback):
+        # Drive changes come from the process-wide monitor shared by all spots
         if callback not in self.usb_detection_callbacks:
             self.usb_detection_callbacks.append(callback)
-        
-        
-        if self.usb_detection_callbacks and not self.usb_detection_active:
-            self.start_usb_detection()
+            get_usb_monitor(ROCustomizationController.get_connected_usb_drives).subscribe(callback)
     
     def unregister_usb_detection_callback(self, callback):
         if callback in self.usb_detection_callbacks:
             self.usb_detection_callbacks.remove(callback)
-            
-        
-        if not self.usb_detection_callbacks and self.usb_detection_active:
-            self.stop_usb_detection()
-    
-    def monitor_usb_drives(self):
-        last_drives = []
-        
-        while self.usb_detection_active:
-            try:
-                
-                drives = self.get_connected_usb_drives()
-                
-                
-                drives_changed = len(drives) != len(last_drives) or any(d1 != d2 for d1, d2 in zip(drives, last_drives) if len(last_drives) == len(drives))
-                
-                if drives_changed:
-                    
-                    last_drives = drives.copy()
-                    
-                    
-                    callbacks = list(self.usb_detection_callbacks)
-                    for callback in callbacks:
-                        try:
-                            callback(drives)
-                        except Exception as e:
-                            print(f"Error in USB detection callback: {str(e)}")
-            except Exception as e:
-                print(f"Error in USB monitoring loop: {str(e)}")
-                
-            time.sleep(2)  
-        
-        
-    
-    def start_usb_detection(self):
-        if not self.usb_detection_active:
-            self.usb_detection_active = True
-            self.usb_thread = threading.Thread(target=self.monitor_usb_drives, daemon=True)
-            self.usb_thread.start()
-            
-    
-    def stop_usb_detection(self):
-        self.usb_detection_active = False
-        if self.usb_thread:
-            self.usb_thread = None  # This doesn't actually stop the thread, just removes the reference
+            get_usb_monitor(ROCustomizationController.get_connected_usb_drives).unsubscribe(callback)
 
     def create_robot_sw(self, usb_path, wo_data):
         """Create robot SW on USB by copying the corresponding DAT file"""
@@ -362,38 +271,13 @@ class ROCustomizationController:
                     is_crx_model = True
                     print(f"CRX model detected: {robot_model}. Using standard memory: {memory_info}")
             
-            # Read file in binary mode
+            # Parse the DAT file (cached per path/size/mtime)
             try:
-                with open(dat_file, 'rb') as f:
-                    file_bytes = f.read()
-                    
-                    # Try different encodings
-                    encodings = ['utf-8', 'latin1', 'iso-8859-1', 'cp1252', 'windows-1252']
-                    decoded_content = None
-                    
-                    for encoding in encodings:
-                        try:
-                            decoded_content = file_bytes.decode(encoding)
-                            print(f"Successfully decoded with {encoding}")
-                            break
-                        except UnicodeDecodeError:
-                            continue
-                    
-                    # Fall back to latin1 which can decode any byte sequence
-                    if decoded_content is None:
-                        decoded_content = file_bytes.decode('latin1', errors='replace')
-                        print("Falling back to latin1 with replacement")
-                    
-                    # Split into lines
-                    content = decoded_content.splitlines(keepends=True)
-                    
-                    # Find memory detail line
-                    for i, line in enumerate(content):
-                        if re.search(r'!SOF Ref8:', line, re.IGNORECASE) and "Mem Detail" in line:
-                            mem_detail_line_index = i
-                            print(f"Found memory detail line: {line.strip()}")
-                            break
-                            
+                record = parse_orderfil(dat_file)
+                content = list(record["lines"])
+                mem_detail_line_index = record["mem_detail_index"]
+                if mem_detail_line_index >= 0:
+                    print(f"Found memory detail line: {content[mem_detail_line_index].strip()}")
             except Exception as e:
                 print(f"Error reading DAT file: {e}")
                 traceback.print_exc()
@@ -449,17 +333,9 @@ class ROCustomizationController:
                             content[mem_detail_line_index] = f"{line.rstrip()} - {memory_info}\n"
                             print(f"Modified to: {content[mem_detail_line_index].strip()}")
                     else:
-                        # If the line was not found, search for other !SOF Ref lines to determine the register
-                        sof_ref_format = "!SOF Ref"  # Default
-                        sof_ref_indices = []
-                        for i, line in enumerate(content):
-                            if re.search(r'![Ss][Oo][Ff] [Rr]ef\d+:', line):
-                                sof_ref_indices.append(i)
-                                # Determine the format used in the file
-                                sof_match = re.search(r'(![Ss][Oo][Ff] [Rr]ef)\d+:', line)
-                                if sof_match:
-                                    sof_ref_format = sof_match.group(1)
-                                    break
+                        # If the line was not found, use the first !SOF Ref line to determine the register
+                        sof_ref_format = record["sof_ref_format"]
+                        sof_ref_indices = [record["sof_ref_index"]] if record["sof_ref_index"] >= 0 else []
                         # Create a line in the correct register
                         new_mem_detail_line = f"{sof_ref_format}8: Mem Detail - {memory_info}\n"
                         print(f"Creating new line: {new_mem_detail_line.strip()}")
@@ -472,30 +348,16 @@ class ROCustomizationController:
                             # If there are no !SOF Ref lines, insert at the beginning
                             content.insert(0, new_mem_detail_line)
                     
-                    # Write the modified file with the same encoding as we read it
-                    temp_file = os.path.join(os.path.dirname(dat_file), f"temp_{os.path.basename(dat_file)}")
-                    
-                    # Use latin1 for writing which can encode any byte
-                    try:
-                        with open(temp_file, 'w', encoding='latin1', errors='replace') as f:
-                            f.writelines(content)
-                    except Exception as e:
-                        print(f"Error writing modified file: {e}")
-                        return False, f"Failed to create modified file: {str(e)}"
-                    
-                    # Копируем модифицированный файл
-                    shutil.copy2(temp_file, target_file)
-                    
-                    # Удаляем временный файл
-                    try:
-                        os.remove(temp_file)
-                    except:
-                        pass
+                    # Patched orderfil is encoded with latin1, which can encode any byte
+                    data = "".join(content).encode('latin1', errors='replace')
                 else:
                     # Если нет информации о памяти, копируем файл без изменений
-                    shutil.copy2(dat_file, target_file)
+                    data = "".join(content).encode(record["encoding"])
                 
-                print(f"SW file copied from {dat_file} to {target_file}")
+                # Write straight to the USB: temp file + fsync + rename, then checksum verification
+                bytes_written, seconds = write_file_atomic(target_file, data)
+                throughput = format_throughput(bytes_written, seconds)
+                print(f"SW file copied from {dat_file} to {target_file}: {throughput}")
                 
                 # Формируем сообщение для пользователя
                 source_filename = os.path.basename(dat_file)
@@ -513,7 +375,7 @@ class ROCustomizationController:
                 
                 memory_info_msg = f" with {memory_info}" if memory_info else ""
                 
-                return True, f"SW file copied from {source_filename} to {target_path_display}{memory_info_msg}"
+                return True, f"SW file copied from {source_filename} to {target_path_display}{memory_info_msg} ({throughput})"
             except Exception as e:
                 print(f"Error copying SW file: {e}")
                 traceback.print_exc()
@@ -525,129 +387,19 @@ class ROCustomizationController:
             return False, f"Error creating robot SW: {str(e)}"
 
     def extract_memory_from_pdf(self, pdf_file_path):
-        """Extract memory information from PDF file"""
-        if not PyPDF2:
-            print("PyPDF2 module not available. Cannot extract memory information.")
-            return None
-
-        try:
-            # Check if the file exists
-            if not os.path.exists(pdf_file_path):
-                print(f"PDF file not found: {pdf_file_path}")
-                return None
-                
-            # Open the PDF file
-            with open(pdf_file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                
-                # Search each page
-                for page_num in range(len(reader.pages)):
-                    text = reader.pages[page_num].extract_text()
-                    
-                    # Search for memory module information
-                    memory_patterns = [
-                        # Various formats with space variations
-                        r'A05B[-\s]2600[-\s]H\d+\s+.*?(FROM\s*\d+\s*MB\s*/\s*SRAM\s*\d+\s*MB)', 
-                        r'A05B[-\s]2600[-\s]H\d+\s+.*?(FROM\s*\d+\s*MB[/\\]\s*SRAM\s*\d+\s*MB)',  
-                        r'(FROM\s*\d+\s*MB\s*/\s*SRAM\s*\d+\s*MB)',  
-                        r'(FROM\s*\d+\s*MB).*?(SRAM\s*\d+\s*MB)'  
-                    ]
-                    
-                    for pattern in memory_patterns:
-                        match = re.search(pattern, text, re.IGNORECASE)
-                        if match:
-                            if len(match.groups()) == 1:
-                                memory_info = match.group(1).strip()
-                                # Normalize format (remove extra spaces)
-                                memory_info = re.sub(r'\s+', ' ', memory_info)
-                                # Replace "FROM xxxMB / SRAM yMB" with "FROMxxxMB/SRAMyMB"
-                                memory_info = re.sub(r'FROM\s+(\d+)\s*MB\s*[/\\]\s*SRAM\s+(\d+)\s*MB', r'FROM\1MB/SRAM\2MB', memory_info, flags=re.IGNORECASE)
-                                return memory_info
-                            elif len(match.groups()) > 1:
-                                # Combine separate parts
-                                from_part = match.group(1).strip()
-                                sram_part = match.group(2).strip()
-                                # Normalize format
-                                from_part = re.sub(r'\s+', '', from_part)
-                                sram_part = re.sub(r'\s+', '', sram_part)
-                                combined = f"{from_part}/{sram_part}"
-                                return combined
-            
-            return None
-                
-        except Exception as e:
-            print(f"Error extracting memory from PDF: {str(e)}")
-            traceback.print_exc()
-            return None
+        """Extract memory information from PDF file (cached per path/size/mtime)"""
+        return extract_memory_info(pdf_file_path)
 
     def find_and_open_dt_file(self, e_number):
         """Find and open DT file for the specified E-number"""
         try:
-            # Clean up the number
-            clean_e_number = e_number.strip().upper()
-            if clean_e_number.startswith("E-"):
-                clean_e_number = "E" + clean_e_number[2:]
-            elif not clean_e_number.startswith("E"):
-                clean_e_number = "E" + clean_e_number
-            
-            # Extract folder range
-            match = re.match(r'E(\d{3})(\d{3})', clean_e_number)
-            if not match:
-                return False, f"Invalid E-number format: {e_number}"
-            
-            first_part = match.group(1)
-            # Correct format for folder range
-            range_folder = f"E{first_part}000-E{first_part}999"
-            
-            # Paths to possible directories
-            base_path = r"\\fanuc\FS\Corporate\Products\Data_Sheets_MD"
-            dt_path = os.path.join(base_path, range_folder, "DT")
-            regular_path = os.path.join(base_path, range_folder)
-            
-            # File may have different formats, search by E-number
-            # Use more general pattern for search but limit extensions
-            e_number_dash = clean_e_number.replace('E', 'E-')
-            
-            # Create search patterns with Excel file extensions
-            patterns = [
-                f"*{e_number_dash}*.xls",   
-                f"*{e_number_dash}*.xlsx",  
-                f"*{e_number_dash}*.xlsm",  
-                f"*{clean_e_number}*.xls",  
-                f"*{clean_e_number}*.xlsx", 
-                f"*{clean_e_number}*.xlsm", 
-            ]
-            
-            found_files = []
-            
-            # Search in all possible locations with all patterns
-            for pattern in patterns:
-                # Search in DT folder
-                if os.path.exists(dt_path):
-                    dt_search = os.path.join(dt_path, pattern)
-                    found_files.extend(glob.glob(dt_search))
-                
-                # Search in regular folder
-                if os.path.exists(regular_path):
-                    regular_search = os.path.join(regular_path, pattern)
-                    found_files.extend(glob.glob(regular_search))
-            
-            # Remove duplicates
-            found_files = list(set(found_files))
+            try:
+                found_files, diagnostic_files = find_dt_files(e_number)
+            except ValueError as e:
+                return False, str(e)
             
-            # If no Excel files found, try to find any files with e-number for diagnostics
+            # If no Excel files found, report other files with the E-number for diagnostics
             if not found_files:
-                # More general search for diagnostics
-                any_patterns = [f"*{e_number_dash}*.*", f"*{clean_e_number}*.*"]
-                diagnostic_files = []
-                
-                for pattern in any_patterns:
-                    if os.path.exists(dt_path):
-                        diagnostic_files.extend(glob.glob(os.path.join(dt_path, pattern)))
-                    if os.path.exists(regular_path):
-                        diagnostic_files.extend(glob.glob(os.path.join(regular_path, pattern)))
-                
-                # If other files found, list them for diagnostics
                 if diagnostic_files:
                     return False, f"No Excel DT file found for {e_number}, but found {len(diagnostic_files)} other files"
                             
@@ -668,42 +420,14 @@ class ROCustomizationController:
     def find_dt_file_path(self, e_number):
         """Find DT file path for the specified E-number (no open, just path)"""
         try:
-            clean_e_number = e_number.strip().upper()
-            if clean_e_number.startswith("E-"):
-                clean_e_number = "E" + clean_e_number[2:]
-            elif not clean_e_number.startswith("E"):
-                clean_e_number = "E" + clean_e_number
-            match = re.match(r'E(\d{3})(\d{3})', clean_e_number)
-            if not match:
-                return False, f"Invalid E-number format: {e_number}"
-            first_part = match.group(1)
-            range_folder = f"E{first_part}000-E{first_part}999"
-            base_path = r"\\fanuc\FS\Corporate\Products\Data_Sheets_MD"
-            dt_path = os.path.join(base_path, range_folder, "DT")
-            regular_path = os.path.join(base_path, range_folder)
-            e_number_dash = clean_e_number.replace('E', 'E-')
-            patterns = [
-                f"*{e_number_dash}*.xls",   
-                f"*{e_number_dash}*.xlsx",  
-                f"*{e_number_dash}*.xlsm",  
-                f"*{clean_e_number}*.xls",  
-                f"*{clean_e_number}*.xlsx", 
-                f"*{clean_e_number}*.xlsm", 
-            ]
-            found_files = []
-            for pattern in patterns:
-                if os.path.exists(dt_path):
-                    dt_search = os.path.join(dt_path, pattern)
-                    found_files.extend(glob.glob(dt_search))
-                if os.path.exists(regular_path):
-                    regular_search = os.path.join(regular_path, pattern)
-                    found_files.extend(glob.glob(regular_search))
-            found_files = list(set(found_files))
+            try:
+                found_files, _ = find_dt_files(e_number)
+            except ValueError as e:
+                return False, str(e)
             if not found_files:
                 return False, f"No DT file found for {e_number}"
             return True, found_files[0]
         except Exception as e:
-            import traceback
             traceback.print_exc()
             return False, f"Error finding DT file: {str(e)}"
 
@@ -736,8 +460,9 @@ class ROCustomizationController:
             traceback.print_exc()
             return False, f"Error creating AOA folder: {str(e)}"
 
-    def move_backup_folders(self, usb_path):
+    def move_backup_folders(self, usb_path, progress_callback=None):
         # Move backup folders from USB to desktop
+        # progress_callback(done_bytes, total_bytes, bytes_per_second, eta_seconds)
         try:
             # Check that USB exists and is readable
             if not os.path.exists(usb_path) or not os.access(usb_path, os.R_OK):
@@ -750,10 +475,6 @@ class ROCustomizationController:
             if not os.path.exists(backup_folder):
                 os.makedirs(backup_folder)
             
-            # Counters for report
-            moved_folders = 0
-            errors = 0
-            
             # Look for folders in format 12345678_E123456 on USB
             backup_folders = []
             for item in os.listdir(usb_path):
@@ -767,27 +488,29 @@ class ROCustomizationController:
             # If no folders to move
             if not backup_folders:
                 return False, "No backup folders found on the USB drive."
-                
-            # Move folders
+            
+            jobs = []
             for item, item_path in backup_folders:
-                try:
-                    target_path = os.path.join(backup_folder, item)
-                    
-                    # If target folder already exists, add timestamp
-                    if os.path.exists(target_path):
-                        import datetime
-                        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                        target_path = os.path.join(backup_folder, f"{item}_{timestamp}")
-                    
-                    # Move folder from USB to desktop
-                    shutil.copytree(item_path, target_path)
-                    
-                    # After successful copy, remove original folder
-                    shutil.rmtree(item_path)
-                    
+                target_path = os.path.join(backup_folder, item)
+                
+                # Resume an interrupted move into the same target, otherwise add timestamp
+                if os.path.exists(target_path) and read_resume_marker(target_path) != os.path.abspath(item_path):
+                    import datetime
+                    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                    target_path = os.path.join(backup_folder, f"{item}_{timestamp}")
+                jobs.append((item_path, target_path))
+            
+            # Copy in parallel, verify every file, then remove the source folders
+            engine = TransferEngine(progress_callback=progress_callback)
+            results = engine.move_folders(jobs)
+            
+            moved_folders = 0
+            errors = 0
+            for item_path, target_path, error in results:
+                if error is None:
                     moved_folders += 1
-                except Exception as e:
-                    print(f"Error moving folder {item}: {str(e)}")
+                else:
+                    print(f"Error moving folder {os.path.basename(item_path)}: {str(error)}")
                     errors += 1
             
             # Create result message
@@ -838,11 +561,7 @@ class ROCustomizationController:
         
     def find_and_open_sw_file(self, wo_number):
         """Find and open SW txt file for the specified WO number in the shared directory"""
-        import glob
-        import os
-        sw_dir = r"\\fanuc\fs\Shared\European_Customisation\ECDC-Customised Robot SW Order File"
-        pattern = os.path.join(sw_dir, f"*{wo_number}*.dat")
-        found_files = glob.glob(pattern)
+        found_files = get_wo_file_index(self.get_wo_search_dir()).lookup(wo_number)["dat"]
         if not found_files:
             return False, f"No SW file found for WO {wo_number}"
         file_to_open = found_files[0]
@@ -858,11 +577,7 @@ class ROCustomizationController:
 
     def find_and_open_bom_file(self, wo_number):
         """Find and open BOM PDF file for the specified WO number in the shared directory"""
-        import glob
-        import os
-        sw_dir = r"\\fanuc\fs\Shared\European_Customisation\ECDC-Customised Robot SW Order File"
-        pattern = os.path.join(sw_dir, f"*{wo_number}*.pdf")
-        found_files = glob.glob(pattern)
+        found_files = get_wo_file_index(self.get_wo_search_dir()).lookup(wo_number)["pdf"]
         if not found_files:
             return False, f"No BOM PDF found for WO {wo_number}"
         file_to_open = found_files[0]
@@ -1,7 +1,11 @@
 import time
-import json
 import os
+import threading
+from types import MappingProxyType
 from config import Config, get_app_data_path
+from models.state_store import create_state_store
+from models.spot_state import SpotState, StationPlace, place_key
+from controllers.persistence_worker import PersistenceWorker
 
 class StationController:
     def __init__(self, config: Config):
@@ -13,8 +17,18 @@ class StationController:
         data_dir = get_app_data_path()
         self.state_file = os.path.join(data_dir, 'spots_state.json')
         
-        self.spots = {}  # Теперь всегда dict[station_id][spot_id]
-        self._dirty_spots = set()  # Track modified spots
+        self.spots = {}  # Теперь всегда dict[station_id][spot_id] -> SpotState
+        self.station_places = {}  # station_id -> StationPlace (dashboard layout)
+        self._status_names = tuple(self.config.get_status_names())
+        self._status_index = {name: i for i, name in enumerate(self._status_names)}
+        self._dirty_spots = set()  # (station_id, spot_id) modified since the last save
+        # Guards _dirty_spots and inserts into spots/station_places, which the
+        # UI thread makes while the persistence worker reads them
+        self._state_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        persistence = self.config.get_persistence_settings()
+        self.store = create_state_store(persistence.get("backend", "json"), self.state_file)
+        self.persistence = PersistenceWorker(self.write_spots_state, persistence.get("debounce_ms", 500) / 1000)
         self.initialize_spots()    # Сначала инициализация структуры
         self.load_spots_state()    # Затем загрузка состояния
 
@@ -38,17 +52,12 @@ class StationController:
             for spot_idx in range(1, spots_per_station + 1):
                 spot_id = f"{station_id}_{spot_idx}"
                 if spot_id not in self.spots[station_id]:
-                    self.spots[station_id][spot_id] = {
-                        "status": self.config.get_spot_statuses()[0]["name"],
-                        "start_time": 0.0,
-                        "elapsed_time": 0.0,
-                        "running": False,
-                        "wo_number": "",
-                    }
+                    self.spots[station_id][spot_id] = SpotState()
 
     def load_spots_state(self):
-        """Load all spots' WO numbers, timer states, and status from a JSON file"""
+        """Load all spots' WO numbers, timer states, and status from the state store"""
         # First try to load from data directory
+        path = None
         if os.path.exists(self.state_file):
             path = self.state_file
         else:
@@ -63,11 +72,9 @@ class StationController:
                     path = self.state_file
                 except Exception:
                     path = src_path
-            else:
-                return
-                
-        with open(path, "r", encoding="utf-8") as f:
-            state = json.load(f)
+
+        # JSON backend replays journal records left by a crash; SQLite imports the JSON once
+        state = self.store.load(path or self.state_file)
         for station_id, spots in state.items():
             # Support both int and string keys (e.g., '1' or 'station_1')
             try:
@@ -78,133 +85,172 @@ class StationController:
                     sid = int(station_id.split("station_")[-1])
                 else:
                     continue
+            place = StationPlace.from_record(spots.get(place_key(sid), {}))
+            if place is not None:
+                self.station_places[sid] = place
             if sid in self.spots:
                 for spot_id, spot_state in spots.items():
                     if spot_id in self.spots[sid]:
-                        self.spots[sid][spot_id]["wo_number"] = spot_state.get("wo_number", "")
-                        self.spots[sid][spot_id]["elapsed_time"] = spot_state.get("elapsed_time", 0)
-                        self.spots[sid][spot_id]["running"] = spot_state.get("running", False)
-                        self.spots[sid][spot_id]["status"] = spot_state.get("status", self.config.get_spot_statuses()[0]["name"])
-                        self.spots[sid][spot_id]["start_time"] = spot_state.get("start_time", 0.0)
-                        # Корректно восстанавливать elapsed_time, если таймер был запущен
-                        if self.spots[sid][spot_id]["running"] and self.spots[sid][spot_id]["start_time"]:
-                            now = time.time()
-                            self.spots[sid][spot_id]["elapsed_time"] += now - self.spots[sid][spot_id]["start_time"]
-                            self.spots[sid][spot_id]["start_time"] = now
+                        # A running timer keeps its start_time; reads add the time since then
+                        self.spots[sid][spot_id] = SpotState.from_record(spot_state, self._status_index)
+        if self.store.records:
+            self.compact_spots_state()
+
+    def _spot_record(self, spot):
+        return spot.to_record(self._status_names)
+
+    def mark_spot_dirty(self, station_id: int, spot_id: str):
+        with self._state_lock:
+            self._dirty_spots.add((station_id, spot_id))
 
     def save_spots_state(self):
-        """Save all spots' WO numbers, timer states, and status to a JSON file"""
-        state = {}
-        # self.spots: {station_id: {spot_id: spot_dict}} или {spot_id: spot_dict}
-        # Авто-определение структуры
-        if all(isinstance(v, dict) and all(isinstance(sv, dict) for sv in v.values()) for v in self.spots.values()):
-            # Структура: {station_id: {spot_id: spot_dict}}
-            for station_id, spots in self.spots.items():
-                state[str(station_id)] = {}
-                for spot_id, spot in spots.items():
-                    state[str(station_id)][spot_id] = {
-                        "wo_number": spot.get("wo_number", ""),
-                        "elapsed_time": spot.get("elapsed_time", 0),
-                        "running": spot.get("running", False),
-                        "status": spot.get("status", self.config.get_spot_statuses()[0]["name"]),
-                        "start_time": spot.get("start_time", 0.0)
-                    }
-        else:
-            # Структура: {spot_id: spot_dict}
-            for spot_id, spot in self.spots.items():
-                state[spot_id] = {
-                    "wo_number": spot.get("wo_number", ""),
-                    "elapsed_time": spot.get("elapsed_time", 0),
-                    "running": spot.get("running", False),
-                    "status": spot.get("status", self.config.get_spot_statuses()[0]["name"])
-                }
-        
-        # Ensure the data directory exists
-        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
-        
-        with open(self.state_file, "w", encoding="utf-8") as f:
-            json.dump(state, f)
+        """Schedule a background write of the modified spots; returns immediately"""
+        self.persistence.request()
 
-    def get_spot_data(self, station_id: int, spot_id: str):
-        if station_id not in self.spots:
-            self.spots[station_id] = {}
-        if spot_id not in self.spots[station_id]:
-            self.spots[station_id][spot_id] = {
-                "status": self.config.get_spot_statuses()[0]["name"],
-                "start_time": 0.0,
-                "elapsed_time": 0.0,
-                "running": False,
-                "wo_number": "",
-            }
-            self._dirty_spots.add(spot_id)  # Mark new spot as modified
-        spot = self.spots[station_id][spot_id]
-        if spot["running"] and not spot_id.startswith("station_"):
-            current_time = time.time()
-            spot["elapsed_time"] += current_time - spot["start_time"]
-            spot["start_time"] = current_time
-            self._dirty_spots.add(spot_id)  # Mark as modified
+    def write_spots_state(self):
+        """Write the spots modified since the last write to the state store"""
+        with self._save_lock:
+            with self._state_lock:
+                dirty, self._dirty_spots = self._dirty_spots, set()
+            changes = []
+            for station_id, spot_id in sorted(dirty, key=str):
+                if spot_id == place_key(station_id):
+                    place = self.station_places.get(station_id)
+                    if place is not None:
+                        changes.append((station_id, spot_id, place.to_record()))
+                    continue
+                spot = self.spots.get(station_id, {}).get(spot_id)
+                if spot is not None:
+                    changes.append((station_id, spot_id, self._spot_record(spot)))
+            try:
+                compact_due = self.store.append(changes)
+            except Exception as e:
+                print(f"Error saving spots state: {e}")
+                with self._state_lock:
+                    self._dirty_spots.update(dirty)
+                return
+        if compact_due:
+            self.compact_spots_state()
+
+    def compact_spots_state(self):
+        """Write the full state from memory (JSON: new snapshot, empty journal)"""
+        with self._save_lock:
+            with self._state_lock:
+                spots_by_station = [(station_id, list(spots.items())) for station_id, spots in self.spots.items()]
+                places = list(self.station_places.items())
+            state = {}
+            for station_id, spots in spots_by_station:
+                state[str(station_id)] = {spot_id: self._spot_record(spot) for spot_id, spot in spots}
+            for station_id, place in places:
+                state.setdefault(str(station_id), {})[place_key(station_id)] = place.to_record()
+            try:
+                self.store.compact(state)
+            except Exception as e:
+                print(f"Error compacting spots state: {e}")
+
+    def close(self):
+        """Flush pending changes into a fresh snapshot; call on exit"""
+        self.persistence.stop()
+        self.compact_spots_state()
+        self.store.close()
+
+    def get_persistence_stats(self):
+        """Save requests vs. writes actually made, plus state store counters"""
+        return dict(self.persistence.get_stats(), store=self.store.get_stats())
+
+    def _get_spot(self, station_id: int, spot_id: str):
+        """Stored SpotState for commands; creates a missing spot"""
+        spot = self.spots.get(station_id, {}).get(spot_id)
+        if spot is None:
+            with self._state_lock:
+                spot = self.spots.setdefault(station_id, {}).setdefault(spot_id, SpotState())
+                self._dirty_spots.add((station_id, spot_id))  # Mark new spot as modified
         return spot
 
+    def get_spot_data(self, station_id: int, spot_id: str):
+        """
+        Read-only snapshot of a spot with elapsed_time computed for now.
+        Never modifies state, so polling it from the UI costs no writes;
+        use the timer/status/WO commands below to change a spot.
+        """
+        spot = self.spots.get(station_id, {}).get(spot_id) or SpotState()
+        return MappingProxyType(spot.snapshot(self._status_names))
+
     def get_timer_value(self, station_id: int, spot_id: str):
-        spot = self.get_spot_data(station_id, spot_id)
-        return spot["elapsed_time"]
+        spot = self.spots.get(station_id, {}).get(spot_id)
+        return spot.elapsed() if spot is not None else 0.0
+
+    def get_station_place(self, station_id: int):
+        """Dashboard (x, y) of a station, or None if it was never placed"""
+        place = self.station_places.get(station_id)
+        return (place.x, place.y) if place is not None else None
+
+    def set_station_place(self, station_id: int, x: float, y: float):
+        place = self.station_places.get(station_id)
+        if place is None:
+            with self._state_lock:
+                self.station_places[station_id] = StationPlace(x, y)
+        elif (place.x, place.y) == (x, y):
+            return
+        else:
+            place.x = x
+            place.y = y
+        self.mark_spot_dirty(station_id, place_key(station_id))
+        self.save_spots_state()
 
     def start_timer(self, station_id: int, spot_id: str):
-        spot = self.get_spot_data(station_id, spot_id)
-        if not spot["running"]:
-            spot["start_time"] = time.time()
-            spot["running"] = True
-            self._dirty_spots.add(spot_id)
+        spot = self._get_spot(station_id, spot_id)
+        if not spot.running:
+            spot.start_time = time.time()
+            spot.running = True
+            self.mark_spot_dirty(station_id, spot_id)
             self.save_spots_state()
 
     def pause_timer(self, station_id: int, spot_id: str):
-        spot = self.get_spot_data(station_id, spot_id)
-        if spot["running"]:
-            spot["elapsed_time"] += time.time() - spot["start_time"]
-            spot["running"] = False
-            self._dirty_spots.add(spot_id)
+        spot = self._get_spot(station_id, spot_id)
+        if spot.running:
+            spot.elapsed_time = spot.elapsed()
+            spot.running = False
+            self.mark_spot_dirty(station_id, spot_id)
             self.save_spots_state()
 
     def stop_timer(self, station_id: int, spot_id: str):
-        spot = self.get_spot_data(station_id, spot_id)
-        if spot["running"]:
-            spot["elapsed_time"] += time.time() - spot["start_time"]
-        spot["running"] = False
-        spot["start_time"] = 0.0
-        self._dirty_spots.add(spot_id)
+        spot = self._get_spot(station_id, spot_id)
+        spot.elapsed_time = spot.elapsed()
+        spot.running = False
+        spot.start_time = 0.0
+        self.mark_spot_dirty(station_id, spot_id)
         self.save_spots_state()
 
     def set_spot_status(self, station_id: int, spot_id: str, status: str):
-        spot = self.get_spot_data(station_id, spot_id)
-        if status in self.config.get_status_names():
-            spot["status"] = status
-            self._dirty_spots.add(spot_id)
+        spot = self._get_spot(station_id, spot_id)
+        if status in self._status_index:
+            spot.status_index = self._status_index[status]
+            self.mark_spot_dirty(station_id, spot_id)
             self.save_spots_state()
 
-    def set_spot_coordinates(self, station_id: int, spot_id: str, x: float, y: float):
-        spot = self.get_spot_data(station_id, spot_id)
-        if "place" not in spot:
-            spot["place"] = {"x": 0, "y": 0}
-        spot["place"]["x"] = x
-        spot["place"]["y"] = y
-        self._dirty_spots.add(spot_id)
+    def set_wo_number(self, station_id: int, spot_id: str, wo_number: str):
+        spot = self._get_spot(station_id, spot_id)
+        spot.wo_number = wo_number
+        self.mark_spot_dirty(station_id, spot_id)
+        self.save_spots_state()
 
     def reset_spot(self, station_id: int, spot_id: str):
-        spot = self.get_spot_data(station_id, spot_id)
-        spot["running"] = False
-        spot["start_time"] = 0.0
-        spot["elapsed_time"] = 0.0
-        spot["status"] = self.config.get_status_names()[0]
-        spot["wo_number"] = ""
-        self._dirty_spots.add(spot_id)
+        spot = self._get_spot(station_id, spot_id)
+        spot.running = False
+        spot.start_time = 0.0
+        spot.elapsed_time = 0.0
+        spot.status_index = 0
+        spot.wo_number = ""
+        self.mark_spot_dirty(station_id, spot_id)
         self.save_spots_state()
 
     def set_timer_value(self, station_id: int, spot_id: str, seconds: int):
         """Set the timer value (elapsed_time) for a spot manually."""
-        spot = self.get_spot_data(station_id, spot_id)
-        spot["elapsed_time"] = seconds
+        spot = self._get_spot(station_id, spot_id)
+        spot.elapsed_time = seconds
         # If timer is running, reset start_time to now
-        if spot["running"]:
-            spot["start_time"] = time.time()
-        self._dirty_spots.add(spot_id)
+        if spot.running:
+            spot.start_time = time.time()
+        self.mark_spot_dirty(station_id, spot_id)
         self.save_spots_state()
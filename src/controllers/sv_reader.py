@@ -0,0 +1,165 @@
+import re
+import struct
+
+# Layout of FANUC binary variable files (.sv/.vr) as far as it is needed here:
+#   header   fe ef 00 01 + uint32 uncompressed size (big-endian)
+#   body     LZSS (4096-byte zero-filled ring, 18-byte max match, LSB-first flags)
+# The decompressed image holds type definitions ("\xfb" NAME_T ...) followed by
+# variables ("\xfc" $NAME ...), all integers big-endian.
+READER_VERSION = 1  # bump when decoding changes, invalidates cached reads
+SV_MAGIC = b"\xfe\xef"
+HEADER_SIZE = 8
+
+_RING_SIZE = 4096
+_MAX_MATCH = 18
+_THRESHOLD = 2
+
+TYPE_DEF = 0xfb
+VAR_DEF = 0xfc
+STRUCT_FLAG = 0x31
+ARRAY_FLAG = 0x20
+INTEGER = 0x10
+REAL = 0x11
+BOOLEAN = 0x12
+_SCALAR_SIZES = {INTEGER: 4, REAL: 4, BOOLEAN: 4}
+
+# "\xfb" NAME_T "\x00" 0x11 <type index>
+_TYPE_HEADER = re.compile(rb"\xfb[A-Z0-9_]+\x00\x11(.)", re.S)
+
+
+def decompress(data: bytes) -> bytes:
+    """Unpack a .sv/.vr file into its variable image"""
+    if len(data) < HEADER_SIZE or data[:2] != SV_MAGIC:
+        raise ValueError("Not a FANUC variable file")
+    expected = struct.unpack(">I", data[4:8])[0]
+    ring = bytearray(_RING_SIZE)
+    r = _RING_SIZE - _MAX_MATCH
+    out = bytearray()
+    i = HEADER_SIZE
+    n = len(data)
+    flags = 0
+    while i < n and len(out) < expected:
+        flags >>= 1
+        if not flags & 0x100:
+            flags = data[i] | 0xff00
+            i += 1
+            if i >= n:
+                break
+        if flags & 1:
+            c = data[i]
+            i += 1
+            out.append(c)
+            ring[r] = c
+            r = (r + 1) & (_RING_SIZE - 1)
+        else:
+            if i + 1 >= n:
+                break
+            pos = data[i] | ((data[i + 1] & 0xf0) << 4)
+            length = (data[i + 1] & 0x0f) + _THRESHOLD + 1
+            i += 2
+            for k in range(length):
+                c = ring[(pos + k) & (_RING_SIZE - 1)]
+                out.append(c)
+                ring[r] = c
+                r = (r + 1) & (_RING_SIZE - 1)
+    if len(out) != expected:
+        raise ValueError(f"Truncated variable file: {len(out)} of {expected} bytes")
+    return bytes(out)
+
+
+def _read_name(image, pos):
+    end = image.index(b"\x00", pos)
+    return image[pos:end].decode("latin1"), end + 1
+
+
+class SVImage:
+    """Decompressed variable file with lookups of struct fields by name"""
+
+    def __init__(self, image: bytes):
+        self.image = image
+
+    @classmethod
+    def from_path(cls, path):
+        with open(path, "rb") as f:
+            return cls(decompress(f.read()))
+
+    def _type_offsets(self):
+        """Start offsets of the struct type definitions, by type index"""
+        offsets = {}
+        var_start = self.image.find(bytes([VAR_DEF]) + b"$")
+        for match in _TYPE_HEADER.finditer(self.image, 0, var_start if var_start >= 0 else len(self.image)):
+            offsets.setdefault(match.group(1)[0], match.start())
+        return offsets
+
+    def _struct_fields(self, type_index):
+        """[(name, flags, type_code, dim)] for a struct type, in storage order"""
+        offsets = self._type_offsets()
+        if type_index not in offsets:
+            raise ValueError(f"Type #{type_index} not defined")
+        image = self.image
+        _, pos = _read_name(image, offsets[type_index] + 1)
+        end = min([o for o in offsets.values() if o > offsets[type_index]] or [len(image)])
+        pos = image.index(b"$", pos)
+        fields = []
+        while pos < end and image[pos:pos + 1] == b"$":
+            name, pos = _read_name(image, pos)
+            if image[pos] != 0x03:
+                raise ValueError(f"Unexpected field header for {name}")
+            flags, type_code = image[pos + 1], image[pos + 2]
+            pos += 3
+            dim = 1
+            if flags & ARRAY_FLAG:
+                dim = struct.unpack(">H", image[pos:pos + 2])[0]
+                pos += 2
+            fields.append((name, flags, type_code, dim))
+            if flags == STRUCT_FLAG:
+                break  # nested struct arrays carry extra bytes we don't decode
+        return fields
+
+    def _variable(self, var_name):
+        """(type_index, count, element_size, data_offset) of a struct-array variable"""
+        marker = bytes([VAR_DEF]) + var_name.encode("latin1") + b"\x00"
+        pos = self.image.find(marker)
+        if pos < 0:
+            raise KeyError(var_name)
+        pos += len(marker)
+        if self.image[pos] != STRUCT_FLAG:
+            raise ValueError(f"{var_name} is not an array of structs")
+        type_index = self.image[pos + 1]
+        # 2 type bytes, 8 bytes of limits, 5 bytes of storage/access flags
+        count, element_size = struct.unpack(">HH", self.image[pos + 15:pos + 19])
+        return type_index, count, element_size, pos + 19
+
+    def read_int_array(self, var_name, index, field):
+        """Values of e.g. $DMR_GRP[index].$MASTER_COUN (INTEGER array field)"""
+        type_index, count, element_size, data = self._variable(var_name)
+        if not 1 <= index <= count:
+            raise IndexError(f"{var_name}[{index}] out of range 1..{count}")
+        pos = data + (index - 1) * element_size
+        limit = pos + element_size
+        image = self.image
+        for name, flags, type_code, dim in self._struct_fields(type_index):
+            if flags == ARRAY_FLAG:
+                n, size = struct.unpack(">HH", image[pos:pos + 4])
+                if n != dim:
+                    raise ValueError(f"Array header mismatch at {name}: {n} != {dim}")
+                if name == field:
+                    if type_code != INTEGER or size != 4:
+                        raise ValueError(f"{field} is not an INTEGER array")
+                    values = struct.unpack(f">{n}i", image[pos + 4:pos + 4 + 4 * n])
+                    return list(values)
+                pos += 4 + n * size
+            elif flags == 0 and type_code in _SCALAR_SIZES:
+                if name == field:
+                    raise ValueError(f"{field} is not an array")
+                pos += _SCALAR_SIZES[type_code]
+            else:
+                raise ValueError(f"Unsupported field layout before {field}: {name}")
+            if pos > limit:
+                raise ValueError(f"Field walk ran past {var_name}[{index}]")
+        raise KeyError(f"{var_name}.{field}")
+
+
+def read_master_counts(sv_path, group=1):
+    """$DMR_GRP[group].$MASTER_COUN from sysmast.sv without kconvars"""
+    return SVImage.from_path(sv_path).read_int_array("$DMR_GRP", group, "$MASTER_COUN")
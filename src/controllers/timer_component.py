@@ -1,6 +1,7 @@
 import flet as ft
-import asyncio
 from controllers.station_controller import StationController
+from controllers.timer_ticker import get_timer_ticker
+from controllers.ui_updates import request_update
 from styles import BG_BUTTON_GREEN, BG_BUTTON_RED, BG_BUTTON_ORANGE, FONT_WEIGHT_BOLD, FONT_WEIGHT_NORMAL, FONT_SIZE_LARGE, FONT_SIZE_NORMAL, TEXT_DEFAULT, TEXT_SECONDARY
 
 class TimerComponent:
@@ -102,12 +103,15 @@ class TimerComponent:
         self.update_button_state(spot["running"], update=False)
         self.update_display(spot["elapsed_time"])
         if spot["running"]:
-            self._task = self.page.run_task(self.update_timer)    
+            get_timer_ticker().register(self)
+
+    @staticmethod
+    def format_elapsed(elapsed_time):
+        total_elapsed = int(elapsed_time)
+        return f"{total_elapsed // 3600:02d}:{(total_elapsed % 3600) // 60:02d}"
+
     def update_display(self, elapsed_time):
         """Update timer display with formatted time"""
-        total_elapsed = int(elapsed_time)
-        hours = total_elapsed // 3600
-        minutes = (total_elapsed % 3600) // 60
         spot = self.controller.get_spot_data(int(self.station_id), self.spot_id)
         # If timer is stopped and labor time is shown, hide all buttons
         if hasattr(self, 'show_labor_time') and self.show_labor_time:
@@ -124,7 +128,7 @@ class TimerComponent:
             # Hide edit button
             self.edit_button.visible = False
         else:
-            self.timer_text.value = f"{hours:02d}:{minutes:02d}"
+            self.timer_text.value = self.format_elapsed(elapsed_time)
             self.timer_text.size = FONT_SIZE_LARGE  # Use normal font size for timer
             if spot and spot["running"]:
                 self.timer_text.color = ft.Colors.BLACK
@@ -141,18 +145,28 @@ class TimerComponent:
                 self.mini_stop_button.visible = (spot and (spot["running"] or spot["elapsed_time"] > 0))
             # Show edit button only if timer was started at least once (elapsed_time > 0 or running)
             self.edit_button.visible = (spot and (spot["running"] or spot["elapsed_time"] > 0))
-        if self.page:
-            self.page.update()
+        request_update(self.page)
+
+    def seconds_to_next_change(self):
+        """Seconds until the hh:mm display rolls over; used by the timer ticker"""
+        return 60 - self.controller.get_timer_value(int(self.station_id), self.spot_id) % 60
 
-    async def update_timer(self):
+    def tick(self):
+        """Timer ticker callback: timer_text if its value changed, None if not, False once stopped"""
         spot = self.controller.get_spot_data(int(self.station_id), self.spot_id)
-        self.update_display(spot["elapsed_time"])
-        while spot and spot["running"]:
-            elapsed_time = self.controller.get_timer_value(int(self.station_id), self.spot_id)
-            self.update_display(elapsed_time)
-            await asyncio.sleep(1)
-            spot = self.controller.get_spot_data(int(self.station_id), self.spot_id)
-        self._task = None
+        if not spot["running"]:
+            return False
+        if getattr(self, 'show_labor_time', False):
+            return None
+        value = self.format_elapsed(spot["elapsed_time"])
+        if value == self.timer_text.value:
+            return None
+        self.timer_text.value = value
+        return self.timer_text
+
+    def dispose(self):
+        """Stop receiving ticks when the view is torn down"""
+        get_timer_ticker().unregister(self)
 
     def update_button_state(self, running, update=True):
         """Update button appearance based on timer state"""
@@ -172,10 +186,8 @@ class TimerComponent:
                 self.mini_start_button.bgcolor = BG_BUTTON_GREEN
         if update:
             # Update all buttons if they are added to the page
-            if self.start_button.page:
-                self.start_button.update()
-            if hasattr(self, 'mini_start_button') and self.mini_start_button.page:
-                self.mini_start_button.update()
+            request_update(self.page, self.start_button)
+            request_update(self.page, self.mini_start_button)
 
     def start_pause(self, e):
         spot = self.controller.get_spot_data(int(self.station_id), self.spot_id)
@@ -188,19 +200,17 @@ class TimerComponent:
             spot = self.controller.get_spot_data(int(self.station_id), self.spot_id)
             self.update_button_state(True)
             self.update_display(spot["elapsed_time"])
-            # Always start update_timer
-            self._task = self.page.run_task(self.update_timer)
+            get_timer_ticker().register(self)
         elif spot:
             self.controller.pause_timer(int(self.station_id), self.spot_id)
+            get_timer_ticker().unregister(self)
             self.update_button_state(False)
             elapsed_time = self.controller.get_timer_value(int(self.station_id), self.spot_id)
             self.update_display(elapsed_time)
 
         # Force update of UI components
-        if hasattr(self, 'mini_start_button') and self.mini_start_button.page:
-            self.mini_start_button.update()
-        if hasattr(self, 'mini_stop_button') and self.mini_stop_button.page:
-            self.mini_stop_button.update()
+        request_update(self.page, self.mini_start_button)
+        request_update(self.page, self.mini_stop_button)
 
         if self.on_state_change:
             self.on_state_change()
@@ -222,18 +232,17 @@ class TimerComponent:
             # Hide mini-buttons if they exist
             if hasattr(self, 'mini_start_button'):
                 self.mini_start_button.visible = False
-                if self.mini_start_button.page:
-                    self.mini_start_button.update()
+                request_update(self.page, self.mini_start_button)
             if hasattr(self, 'mini_stop_button'):
                 self.mini_stop_button.visible = False
-                if self.mini_stop_button.page:
-                    self.mini_stop_button.update()
+                request_update(self.page, self.mini_stop_button)
             # Hide edit button
             self.edit_button.visible = False
 
             self.controller.stop_timer(int(self.station_id), self.spot_id)
+            get_timer_ticker().unregister(self)
             self.update_button_state(False)
-            self.page.update()
+            request_update(self.page)
             if hasattr(self, 'on_state_change') and self.on_state_change:
                 self.on_state_change()
 
@@ -242,15 +251,14 @@ class TimerComponent:
         spot = self.controller.get_spot_data(int(self.station_id), self.spot_id)
         if spot and spot["running"]:
             self.controller.pause_timer(int(self.station_id), self.spot_id)
+            get_timer_ticker().unregister(self)
             self.update_button_state(False)
             elapsed_time = self.controller.get_timer_value(int(self.station_id), self.spot_id)
             self.update_display(elapsed_time)
 
             # Update mini-buttons if they exist
-            if hasattr(self, 'mini_start_button') and self.mini_start_button.page:
-                self.mini_start_button.update()
-            if hasattr(self, 'mini_stop_button') and self.mini_stop_button.page:
-                self.mini_stop_button.update()
+            request_update(self.page, self.mini_start_button)
+            request_update(self.page, self.mini_stop_button)
 
             if self.on_state_change:
                 self.on_state_change()
@@ -258,6 +266,7 @@ class TimerComponent:
     def reset(self):
         """Reset the timer to initial state"""
         self.controller.reset_spot(int(self.station_id), self.spot_id)
+        get_timer_ticker().unregister(self)
         self.update_button_state(False)
         self.show_labor_time = False
         self.labor_time_text = ""
@@ -265,12 +274,10 @@ class TimerComponent:
         # Show mini-buttons if they exist
         if hasattr(self, 'mini_start_button'):
             self.mini_start_button.visible = True
-            if self.mini_start_button.page:
-                self.mini_start_button.update()
+            request_update(self.page, self.mini_start_button)
         if hasattr(self, 'mini_stop_button'):
             self.mini_stop_button.visible = True
-            if self.mini_stop_button.page:
-                self.mini_stop_button.update()
+            request_update(self.page, self.mini_stop_button)
 
         self.update_display(0)
         if self.on_state_change:
@@ -284,11 +291,11 @@ class TimerComponent:
         time_field = ft.TextField(label="Set time (hh:mm)", value=f"{current_h:02d}:{current_m:02d}", width=120)
         def close_dialog(_):
             dialog.open = False
-            self.page.update()
+            request_update(self.page)
         def ok_action(_):
             self.apply_edit_time(time_field.value)
             dialog.open = False
-            self.page.update()
+            request_update(self.page)
         dialog = ft.AlertDialog(
             modal=True,
             title=ft.Text("Edit Timer"),
@@ -301,7 +308,7 @@ class TimerComponent:
         if dialog not in self.page.overlay:
             self.page.overlay.append(dialog)
         dialog.open = True
-        self.page.update()
+        request_update(self.page)
 
     def apply_edit_time(self, value):
         try:
@@ -349,6 +356,8 @@ class TimerComponent:
         spot = self.controller.get_spot_data(int(self.station_id), self.spot_id)
         self.update_button_state(spot["running"], update=True)
         self.update_display(spot["elapsed_time"])
-        # Не запускать update_timer автоматически, только если running
+        # Тикер только для запущенных таймеров
         # (иначе таймеры будут тикать после рестарта, если не нужно)
+        if spot["running"]:
+            get_timer_ticker().register(self)
         # Кнопки и текст всегда будут в актуальном состоянии
\ No newline at end of file
@@ -0,0 +1,109 @@
+import threading
+
+from controllers.ui_updates import get_update_scheduler
+
+TICK_MARGIN = 0.05  # seconds past the boundary, so int(elapsed) has rolled over
+MAX_SLEEP = 60
+
+
+class TimerTicker:
+    """
+    App-wide ticker for running TimerComponents. The display is hh:mm, so one
+    background thread sleeps until the next minute boundary of any registered
+    timer, asks each timer for its new text, and sends only the Text controls
+    that changed in one batched update per page. The thread exits when the last
+    timer unregisters.
+
+    A registered component provides:
+      seconds_to_next_change() -> seconds until its displayed value changes
+      tick() -> the changed control or None; False once the timer stopped running
+    """
+
+    def __init__(self):
+        self._timers = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.stats = {"ticks": 0, "controls_updated": 0, "last_tick_updated": 0}
+
+    def register(self, timer):
+        with self._lock:
+            if timer not in self._timers:
+                self._timers.append(timer)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="timer-ticker", daemon=True)
+                self._thread.start()
+            self._wake.set()  # recompute the next boundary
+
+    def unregister(self, timer):
+        with self._lock:
+            if timer in self._timers:
+                self._timers.remove(timer)
+            self._wake.set()
+
+    def timer_count(self):
+        with self._lock:
+            return len(self._timers)
+
+    def _next_delay(self, timers):
+        delay = MAX_SLEEP
+        for timer in timers:
+            try:
+                delay = min(delay, timer.seconds_to_next_change())
+            except Exception as ex:
+                print(f"Error in timer ticker: {ex}")
+        return max(0.0, delay) + TICK_MARGIN
+
+    def _run(self):
+        while True:
+            with self._lock:
+                self._wake.clear()
+                if not self._timers:
+                    self._thread = None
+                    return
+                timers = list(self._timers)
+            if self._wake.wait(self._next_delay(timers)):
+                continue  # timers changed; sleep again from the new set
+            self.tick()
+
+    def tick(self):
+        """Refresh all registered timers once; returns the number of controls updated"""
+        with self._lock:
+            timers = list(self._timers)
+        changed = {}  # page -> controls
+        finished = []
+        for timer in timers:
+            try:
+                control = timer.tick()
+            except Exception as ex:
+                print(f"Error in timer ticker: {ex}")
+                continue
+            if control is False:
+                finished.append(timer)
+            elif control is not None and control.page is not None:
+                changed.setdefault(control.page, []).append(control)
+        for timer in finished:
+            self.unregister(timer)
+        updated = 0
+        for page, controls in changed.items():
+            get_update_scheduler(page).request(*controls)
+            updated += len(controls)
+        with self._lock:
+            self.stats["ticks"] += 1
+            self.stats["controls_updated"] += updated
+            self.stats["last_tick_updated"] = updated
+        return updated
+
+    def get_stats(self):
+        """Ticks run and timer controls sent, overall and per tick"""
+        with self._lock:
+            stats = dict(self.stats, timers=len(self._timers))
+        stats["avg_per_tick"] = stats["controls_updated"] / stats["ticks"] if stats["ticks"] else 0.0
+        return stats
+
+
+_ticker = TimerTicker()
+
+
+def get_timer_ticker():
+    return _ticker
@@ -0,0 +1,99 @@
+import threading
+import weakref
+
+FRAME_BUDGET = 0.016  # seconds; requests within one frame share a single update
+
+
+class UpdateScheduler:
+    """
+    Coalesces page.update() calls. request() only marks the page (or some
+    controls) dirty; the first request of a frame arms a timer and the flush
+    sends everything pending in one update. Safe to call from any thread.
+    A request without controls means a full page update and covers any
+    control requests of the same frame.
+    """
+
+    def __init__(self, page, frame=FRAME_BUDGET):
+        # Weak, so the scheduler registry doesn't keep closed pages alive
+        self._page = weakref.ref(page)
+        self.frame = frame
+        self._lock = threading.Lock()
+        self._controls = {}  # id -> control, pending partial updates
+        self._full = False
+        self._timer = None
+        self.stats = {"requested": 0, "flushed": 0, "errors": 0}
+
+    def request(self, *controls):
+        with self._lock:
+            self.stats["requested"] += 1
+            if controls:
+                for control in controls:
+                    self._controls[id(control)] = control
+            else:
+                self._full = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.frame, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Send pending changes now; a no-op if nothing is pending"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()  # no-op when called from the timer itself
+                self._timer = None
+            full, controls = self._full, list(self._controls.values())
+            self._full = False
+            self._controls = {}
+        page = self._page()
+        if page is None or (not full and not controls):
+            return
+        try:
+            if full:
+                page.update()
+            else:
+                mounted = [control for control in controls if control.page is not None]
+                if not mounted:
+                    return
+                page.update(*mounted)
+            with self._lock:
+                self.stats["flushed"] += 1
+        except Exception as e:
+            print(f"Error updating page: {e}")
+            with self._lock:
+                self.stats["errors"] += 1
+
+    def get_stats(self):
+        """Update requests vs. updates actually sent"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["saved"] = max(0, stats["requested"] - stats["flushed"])
+        return stats
+
+
+_schedulers = weakref.WeakKeyDictionary()
+_schedulers_lock = threading.Lock()
+
+
+def get_update_scheduler(page):
+    with _schedulers_lock:
+        scheduler = _schedulers.get(page)
+        if scheduler is None:
+            scheduler = _schedulers[page] = UpdateScheduler(page)
+        return scheduler
+
+
+def call_on_ui(page, fn, *args):
+    """Run fn(*args) on the page's event loop; use from worker threads instead of touching controls"""
+    async def _call():
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"Error in UI callback: {e}")
+    page.run_task(_call)
+
+
+def request_update(page, *controls):
+    """Batched replacement for page.update() / control.update()"""
+    if page is not None:
+        get_update_scheduler(page).request(*controls)
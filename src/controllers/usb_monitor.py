@@ -0,0 +1,300 @@
+import os
+import select
+import threading
+
+POLL_INTERVAL = 2.0  # seconds, polling fallback
+NOTIFY_TIMEOUT = 30.0  # seconds, safety rescan for event-driven backends
+LINUX_MOUNT_ROOTS = ("/media/", "/run/media/", "/mnt/")
+
+
+class PollingBackend:
+    """Rescans the drive list every interval; works everywhere"""
+
+    def __init__(self, list_drives, interval=POLL_INTERVAL):
+        self.list_drives = list_drives
+        self.interval = interval
+        self._stop = threading.Event()
+
+    def open(self):
+        self._stop.clear()
+
+    def wait_for_change(self):
+        self._stop.wait(self.interval)
+
+    def wake(self):
+        self._stop.set()
+
+    def close(self):
+        pass
+
+
+class LinuxMountsBackend:
+    """Waits for mount table changes signalled by /proc/mounts"""
+
+    def __init__(self, list_drives=None, timeout=NOTIFY_TIMEOUT):
+        self.list_drives = list_drives or self._list_mounted_drives
+        self.timeout = timeout
+        self._mounts = None
+        self._poller = None
+        self._wake_r, self._wake_w = None, None
+
+    def open(self):
+        self._mounts = open("/proc/mounts", "r")
+        self._wake_r, self._wake_w = os.pipe()
+        self._poller = select.poll()
+        self._poller.register(self._mounts, select.POLLERR | select.POLLPRI)
+        self._poller.register(self._wake_r, select.POLLIN)
+
+    def wait_for_change(self):
+        for fd, _ in self._poller.poll(self.timeout * 1000):
+            if fd == self._wake_r:
+                os.read(self._wake_r, 64)
+        # The mount table must be re-read to re-arm POLLPRI
+        self._mounts.seek(0)
+        self._mounts.read()
+
+    def wake(self):
+        if self._wake_w is not None:
+            os.write(self._wake_w, b"x")
+
+    def close(self):
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                os.close(fd)
+        self._wake_r = self._wake_w = None
+        if self._mounts:
+            self._mounts.close()
+            self._mounts = None
+
+    @staticmethod
+    def _list_mounted_drives():
+        drives = []
+        with open("/proc/mounts", "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 2:
+                    continue
+                mount_point = parts[1].replace("\\040", " ")
+                if mount_point.startswith(LINUX_MOUNT_ROOTS):
+                    drives.append((mount_point, f"{mount_point} USB Drive"))
+        return drives
+
+
+class WindowsDeviceChangeBackend:
+    """Waits for WM_DEVICECHANGE volume arrival/removal on a hidden top-level window"""
+
+    WM_DEVICECHANGE = 0x0219
+
+    def __init__(self, list_drives, timeout=NOTIFY_TIMEOUT):
+        import win32api
+        import win32event
+        import win32gui
+        self.win32api = win32api
+        self.win32event = win32event
+        self.win32gui = win32gui
+        self.list_drives = list_drives
+        self.timeout = timeout
+        self._hwnd = None
+        self._wake_event = None
+
+    def _wnd_proc(self, hwnd, msg, wparam, lparam):
+        # Any device message wakes the wait; the monitor rescans and diffs
+        return True
+
+    def open(self):
+        # Must run on the monitor thread: the window's messages are pumped there.
+        # Volume broadcasts only reach top-level windows, so no HWND_MESSAGE parent.
+        wc = self.win32gui.WNDCLASS()
+        wc.lpfnWndProc = {self.WM_DEVICECHANGE: self._wnd_proc}
+        wc.lpszClassName = "ECDCUsbMonitor"
+        wc.hInstance = self.win32api.GetModuleHandle(None)
+        try:
+            class_atom = self.win32gui.RegisterClass(wc)
+        except self.win32gui.error:
+            class_atom = wc.lpszClassName  # already registered by a previous run
+        self._hwnd = self.win32gui.CreateWindow(
+            class_atom, "ECDCUsbMonitor", 0, 0, 0, 0, 0,
+            0, 0, wc.hInstance, None
+        )
+        self._wake_event = self.win32event.CreateEvent(None, False, False, None)
+
+    def wait_for_change(self):
+        self.win32event.MsgWaitForMultipleObjects(
+            [self._wake_event], False, int(self.timeout * 1000), self.win32event.QS_ALLINPUT
+        )
+        self.win32gui.PumpWaitingMessages()
+
+    def wake(self):
+        if self._wake_event is not None:
+            self.win32event.SetEvent(self._wake_event)
+
+    def close(self):
+        if self._hwnd:
+            self.win32gui.DestroyWindow(self._hwnd)
+            self._hwnd = None
+
+
+class FakeBackend:
+    """Drive list controlled by the caller; set_drives() signals a change"""
+
+    def __init__(self, drives=None):
+        self.drives = list(drives or [])
+        self._event = threading.Event()
+
+    def list_drives(self):
+        return list(self.drives)
+
+    def set_drives(self, drives):
+        self.drives = list(drives)
+        self._event.set()
+
+    def open(self):
+        pass
+
+    def wait_for_change(self):
+        self._event.wait()
+        self._event.clear()
+
+    def wake(self):
+        self._event.set()
+
+    def close(self):
+        pass
+
+
+def create_default_backend(list_drives):
+    """Event-driven backend for the platform when available, polling otherwise"""
+    if os.name == 'nt':
+        try:
+            return WindowsDeviceChangeBackend(list_drives)
+        except ImportError:
+            return PollingBackend(list_drives)
+    if os.path.exists("/proc/mounts") and hasattr(select, "poll"):
+        return LinuxMountsBackend(list_drives)
+    return PollingBackend(list_drives)
+
+
+class USBMonitor:
+    """
+    Process-wide removable drive monitor. One thread watches the backend and
+    fans out changes to all subscribers; it stops when the last one leaves.
+
+    Subscribers are called as callback(drives), or callback(drives, added, removed)
+    when subscribed with with_changes=True.
+    """
+
+    def __init__(self, backend_factory, list_drives=None):
+        self.backend_factory = backend_factory
+        self.list_drives = list_drives
+        self._subscribers = []  # list of (callback, with_changes)
+        self._drives = None
+        self._lock = threading.Lock()
+        self._backend = None
+        self._thread = None
+        self._running = False
+
+    def subscribe(self, callback, with_changes=False):
+        with self._lock:
+            if any(cb == callback for cb, _ in self._subscribers):
+                return
+            self._subscribers.append((callback, with_changes))
+            drives = self._drives
+            if not self._running:
+                self._running = True
+                self._backend = self.backend_factory()
+                self._thread = threading.Thread(target=self._run, args=(self._backend,), daemon=True)
+                self._thread.start()
+                drives = None  # the new thread reports the first scan
+        if drives is not None:
+            self._notify([(callback, with_changes)], drives, drives, [])
+
+    def _list_drives(self):
+        # Late-bound, so a lister rebound by get_usb_monitor() reaches a running backend
+        return self.list_drives() if self.list_drives else []
+
+    def unsubscribe(self, callback):
+        """Never blocks: the monitor thread is only signalled and closes its backend itself"""
+        with self._lock:
+            self._subscribers = [(cb, wc) for cb, wc in self._subscribers if cb != callback]
+            if self._subscribers or not self._running:
+                return
+            self._running = False
+            backend = self._backend
+            self._backend = None
+            self._thread = None
+            self._drives = None
+        backend.wake()
+
+    def is_running(self):
+        with self._lock:
+            return self._running
+
+    def get_drives(self):
+        with self._lock:
+            return list(self._drives) if self._drives is not None else None
+
+    def _notify(self, subscribers, drives, added, removed):
+        for callback, with_changes in subscribers:
+            try:
+                if with_changes:
+                    callback(list(drives), added, removed)
+                else:
+                    callback(list(drives))
+            except Exception as e:
+                print(f"Error in USB detection callback: {str(e)}")
+
+    def _run(self, backend):
+        try:
+            backend.open()
+        except Exception as e:
+            print(f"USB monitor backend failed, falling back to polling: {e}")
+            backend = PollingBackend(backend.list_drives)
+            with self._lock:
+                if self._backend is not None:
+                    self._backend = backend
+            backend.open()
+        last = None
+        try:
+            while True:
+                with self._lock:
+                    if not self._running or self._backend is not backend:
+                        break
+                try:
+                    drives = backend.list_drives()
+                except Exception as e:
+                    print(f"Error in USB monitoring loop: {str(e)}")
+                    drives = last or []
+                if drives != last:
+                    added = [d for d in drives if d not in (last or [])]
+                    removed = [d for d in (last or []) if d not in drives]
+                    with self._lock:
+                        self._drives = list(drives)
+                        subscribers = list(self._subscribers)
+                    last = list(drives)
+                    self._notify(subscribers, drives, added, removed)
+                backend.wait_for_change()
+        finally:
+            backend.close()
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_usb_monitor(list_drives=None, backend_factory=None):
+    """
+    Shared monitor. list_drives should be a plain function (not a bound method,
+    which would keep its object alive); a different one replaces the current.
+    """
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            monitor = USBMonitor(backend_factory, list_drives)
+            if backend_factory is None:
+                monitor.backend_factory = lambda: create_default_backend(
+                    monitor._list_drives if monitor.list_drives else None
+                )
+            _monitor = monitor
+        elif list_drives is not None and list_drives != _monitor.list_drives:
+            _monitor.list_drives = list_drives
+        return _monitor
@@ -0,0 +1,166 @@
+import abc
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from config import get_app_data_path
+
+# Default SW order-file share when config has no search_directory
+SW_ORDER_DIR = r"\\fanuc\fs\Shared\European_Customisation\ECDC-Customised Robot SW Order File"
+
+INDEX_EXTENSIONS = (".dat", ".pdf")
+RECHECK_INTERVAL = 5.0  # seconds between directory mtime checks
+
+_digit_run = re.compile(r"\d{8,}")
+
+
+def _wo_keys(filename):
+    # Every 8-digit window, so lookups match like the old `wo_number in filename`
+    keys = set()
+    for match in _digit_run.finditer(filename):
+        run = match.group(0)
+        for i in range(len(run) - 7):
+            keys.add(run[i:i + 8])
+    return keys
+
+
+class DirectoryIndex(abc.ABC):
+    """
+    Index of key -> file names in a (network) directory.
+
+    The directory is listed with os.scandir only when its mtime changes, and the
+    file list is persisted under the app data dir so a restart doesn't need a
+    network listing either. Subclasses define keys_for() and extensions.
+    """
+
+    cache_prefix = "dir_index"
+    extensions = None  # None indexes every file
+
+    def __init__(self, directory, cache_dir=None):
+        self.directory = directory
+        digest = hashlib.sha1(directory.lower().encode("utf-8")).hexdigest()[:12]
+        self.cache_path = os.path.join(cache_dir or get_app_data_path(), "cache", f"{self.cache_prefix}_{digest}.json")
+        self._files = set()
+        self._by_key = {}
+        self._dir_mtime = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.stats = {"lookups": 0, "scans": 0}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("directory") != self.directory:
+                return
+            self._dir_mtime = data.get("dir_mtime")
+            for name in data.get("files", []):
+                self._add(name)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            pass
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "directory": self.directory,
+                    "dir_mtime": self._dir_mtime,
+                    "files": sorted(self._files),
+                }, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Error saving file index: {e}")
+
+    @abc.abstractmethod
+    def keys_for(self, name):
+        """Keys a file name is indexed under"""
+
+    def _add(self, name):
+        self._files.add(name)
+        for key in self.keys_for(name):
+            self._by_key.setdefault(key, set()).add(name)
+
+    def _remove(self, name):
+        self._files.discard(name)
+        for key in self.keys_for(name):
+            names = self._by_key.get(key)
+            if names:
+                names.discard(name)
+                if not names:
+                    del self._by_key[key]
+
+    def refresh(self, force=False):
+        """Rescan the directory if its mtime changed; returns False if it is unreachable"""
+        now = time.monotonic()
+        with self._lock:
+            if not force and self._dir_mtime is not None and now - self._last_check < RECHECK_INTERVAL:
+                return True
+            try:
+                mtime = os.stat(self.directory).st_mtime
+            except OSError:
+                return False
+            self._last_check = now
+            if not force and mtime == self._dir_mtime:
+                return True
+            current = set()
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if self.extensions and not entry.name.lower().endswith(self.extensions):
+                        continue
+                    if entry.is_file():
+                        current.add(entry.name)
+            for name in self._files - current:
+                self._remove(name)
+            for name in current - self._files:
+                self._add(name)
+            self._dir_mtime = mtime
+            self.stats["scans"] += 1
+            self._save()
+            return True
+
+    def lookup_paths(self, key):
+        """Return sorted full paths of files indexed under key"""
+        self.refresh()
+        with self._lock:
+            self.stats["lookups"] += 1
+            names = sorted(self._by_key.get(key, ()))
+        return [os.path.join(self.directory, name) for name in names]
+
+
+class WOFileIndex(DirectoryIndex):
+    """Index of WO number -> .dat/.pdf files in the SW order-file share"""
+
+    cache_prefix = "wo_index"
+    extensions = INDEX_EXTENSIONS
+
+    def keys_for(self, name):
+        return _wo_keys(name)
+
+    def lookup(self, wo_number):
+        """Return {"dat": [paths], "pdf": [paths]} for the WO number"""
+        result = {"dat": [], "pdf": []}
+        for path in self.lookup_paths(wo_number):
+            name = os.path.basename(path)
+            ext = os.path.splitext(name)[1].lower()
+            result[ext[1:]].append(path)
+        return result
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_wo_file_index(directory):
+    """Shared index instance per directory"""
+    with _indexes_lock:
+        index = _indexes.get(directory)
+        if index is None:
+            index = WOFileIndex(directory)
+            _indexes[directory] = index
+        return index
@@ -0,0 +1,89 @@
+import threading
+
+from models.wo_cache import refresh_user_wo_numbers
+
+WO_REFRESH_INTERVAL = 120  # seconds
+
+
+class WOListRefresher:
+    """
+    App-wide poller of WO lists. One background thread re-queries each subscribed
+    SSO once per interval and notifies subscribers only when the list changed.
+    The thread exits when the last subscriber unsubscribes.
+    """
+
+    def __init__(self, interval=WO_REFRESH_INTERVAL, fetch=refresh_user_wo_numbers):
+        self.interval = interval
+        self.fetch = fetch
+        self._subscribers = {}  # sso -> list of callbacks
+        self._last = {}  # sso -> list of WO numbers last pushed
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.polls = 0
+
+    def subscribe(self, sso, callback, current=None):
+        """Register callback(wo_numbers) for SSO; current is the list the caller already shows"""
+        with self._lock:
+            callbacks = self._subscribers.setdefault(sso, [])
+            if callback not in callbacks:
+                callbacks.append(callback)
+            if current is not None and sso not in self._last:
+                self._last[sso] = [str(wo) for wo in current]
+            if self._thread is None or not self._thread.is_alive():
+                self._wake.clear()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def unsubscribe(self, sso, callback):
+        with self._lock:
+            callbacks = self._subscribers.get(sso, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self._subscribers.pop(sso, None)
+                self._last.pop(sso, None)
+            if not self._subscribers:
+                self._wake.set()
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(callbacks) for callbacks in self._subscribers.values())
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            with self._lock:
+                self._wake.clear()
+                if not self._subscribers:
+                    self._thread = None
+                    return
+                ssos = list(self._subscribers)
+            for sso in ssos:
+                self.poll(sso)
+
+    def poll(self, sso):
+        """Query the WO list for SSO once and push it to subscribers if it changed"""
+        try:
+            wo_numbers = [str(wo) for wo in self.fetch(sso)]
+        except Exception as ex:
+            print(f"WO background update error: {ex}")
+            return
+        with self._lock:
+            self.polls += 1
+            if self._last.get(sso) == wo_numbers:
+                return
+            self._last[sso] = wo_numbers
+            callbacks = list(self._subscribers.get(sso, []))
+        for callback in callbacks:
+            try:
+                callback(wo_numbers)
+            except Exception as ex:
+                print(f"Error in WO list subscriber: {ex}")
+
+
+_refresher = WOListRefresher()
+
+
+def get_wo_refresher():
+    return _refresher
@@ -5,6 +5,7 @@ from controllers.timer_component import TimerComponent
 
 import flet as ft
 from controllers.station_controller import StationController
+from controllers.ui_updates import request_update
 from styles import BG_MAIN, BG_CONTAINER, PADDING_MAIN, BORDER_RADIUS_DROPDOWN, FONT_SIZE_SMALL, PADDING_DROPDOWN
 
 from views.station_view import StationView
@@ -15,12 +16,15 @@ from views.dashboard_view import DashboardView
 from views.top_bar import TopBar
 from config import Config
 from models.user_model import UserModel
+from models.db_connector import get_pool, set_replica
+from models.wo_cache import configure_cache
 
 def format_display_name(full_name):
     return full_name
 
 async def main(page: ft.Page):
     config = Config()
+    configure_cache(config.get_cache_settings())
     app_settings = config.get_app_settings()
     controller = StationController(config)
     config.set_controller(controller)
@@ -55,6 +59,18 @@ async def main(page: ft.Page):
     if not current_sso:
         current_sso = os.getlogin() if hasattr(os, 'getlogin') else "Unknown SSO"
 
+    replica_settings = config.get_local_replica_settings()
+    replica = None
+    if replica_settings.get("enabled"):
+        from models.local_replica import LocalReplica
+        try:
+            replica = LocalReplica(sync_interval=replica_settings.get("sync_interval", 300))
+            set_replica(replica)
+            replica.track_user(current_sso)
+        except Exception as ex:
+            print(f"Local replica unavailable: {ex}")
+            replica = None
+
     main_container = ft.Container(expand=True, bgcolor=BG_CONTAINER)
     nav_rail_view = NavigationRailView(page, menu_items, lambda idx: update_module(idx)) if show_nav_rail else None
     nav_rail = nav_rail_view.build() if nav_rail_view else None
@@ -73,6 +89,7 @@ async def main(page: ft.Page):
 
 
     station_dropdown = None
+    current_station_view = None
     current_station_id = None
     selected_module_index = 0
 
@@ -94,11 +111,18 @@ async def main(page: ft.Page):
             tooltip="Change Station"
         )
 
+    def dispose_station_view():
+        nonlocal current_station_view
+        if current_station_view is not None:
+            current_station_view.dispose()
+            current_station_view = None
+
     def create_station_view(station_id=None):
         sid = int(station_id) if station_id is not None else int(stations[0])
-        nonlocal current_station_id
+        nonlocal current_station_id, current_station_view
         current_station_id = sid
-        return StationView(page, controller, config, sid, module_container, stations_count, update_module).build()
+        current_station_view = StationView(page, controller, config, sid, module_container, stations_count, update_module)
+        return current_station_view.build()
 
     def create_dashboard_view():
         return DashboardView(page, controller, config, module_container, update_module).build()
@@ -122,6 +146,7 @@ async def main(page: ft.Page):
     def update_module(selected_index, station_id=None):
         nonlocal selected_module_index
         selected_module_index = selected_index
+        dispose_station_view()
         if not show_nav_rail:
             new_content = create_station_view(station_id if station_id else stations[0])
             update_topbar(0, station_id if station_id else stations[0])
@@ -148,7 +173,7 @@ async def main(page: ft.Page):
     page.update_module = update_module
 
     def adjust_module_width(e=None):
-        page.update()
+        request_update(page)
 
     def show_main_interface(selected_station_id, _):
         nonlocal current_station_id
@@ -156,22 +181,28 @@ async def main(page: ft.Page):
         page.clean()
         page.add(main_container)
         update_module(0, selected_station_id)
-        page.update()
+        request_update(page)
 
     def show_welcome_view():
+        dispose_station_view()
         page.appbar = None
         page.clean()
         welcome_view = WelcomeView(page, controller, lambda station_id, _: show_main_interface(station_id, None))
         page.add(welcome_view.build())
-        page.update()
+        request_update(page)
 
     def on_close(e):
+        dispose_station_view()
         controller.save_spots_state()
         for station_id in controller.get_stations():
             for spot_idx in range(1, app_settings["spots"] + 1):
                 spot_id = f"{station_id}_{spot_idx}"
                 timer = TimerComponent(page, str(station_id), spot_id, controller)
                 timer.pause_on_close()
+        controller.close()
+        if replica is not None:
+            replica.stop()
+        get_pool().close_all()
     
 
     page.on_resized = adjust_module_width
@@ -229,7 +260,7 @@ async def main(page: ft.Page):
     else:
         welcome_view = WelcomeView(page, controller, lambda station_id, _: show_main_interface(station_id, None))
         page.add(welcome_view.build())
-        page.update()
+        request_update(page)
         if hasattr(welcome_view, 'auto_transition_needed') and welcome_view.auto_transition_needed:
             await welcome_view.run_auto_transition()
 
@@ -1,40 +1,191 @@
 import pyodbc
 import re
+import threading
+import time
+from contextlib import contextmanager
 
 DSN = 'CNC_HW_Details_id'
 DATABASE = 'CNC_HW_DETAILS'
 TABLE = 'PartsList_Robotics'
 SCHEMA = 'dbo'
 
+# Connection pool settings
+POOL_MAX_SIZE = 4
+POOL_CHECKOUT_TIMEOUT = 30.0  # seconds to wait for a free connection
+POOL_IDLE_TIMEOUT = 300.0  # idle connections older than this are closed
+
+# SQL Server allows at most 2100 parameters per statement
+BULK_CHUNK_SIZE = 500
+
 # Универсальная функция подключения
 
 def get_connection():
     return pyodbc.connect(f'DSN={DSN};DATABASE={DATABASE};Trusted_Connection=yes;')
 
+
+class ConnectionPool:
+    """Thread-safe bounded pool of pyodbc connections shared by all callers."""
+
+    def __init__(self, factory=get_connection, max_size=POOL_MAX_SIZE, idle_timeout=POOL_IDLE_TIMEOUT):
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._idle = []  # list of (connection, last_used)
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self.stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "created": 0,
+            "reconnects": 0,
+            "evicted": 0,
+        }
+
+    def _is_alive(self, conn):
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _evict_idle(self):
+        # Caller must hold self._cond
+        now = time.monotonic()
+        keep = []
+        for conn, last_used in self._idle:
+            if now - last_used > self.idle_timeout:
+                self._close(conn)
+                self.stats["evicted"] += 1
+            else:
+                keep.append((conn, last_used))
+        self._idle = keep
+
+    def acquire(self, timeout=POOL_CHECKOUT_TIMEOUT):
+        """Check out a healthy connection, opening a new one if the pool has room."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._evict_idle()
+            waited = False
+            while not self._idle and self._in_use >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("Timed out waiting for a database connection")
+                if not waited:
+                    self.stats["waits"] += 1
+                    waited = True
+                self._cond.wait(remaining)
+            conn = self._idle.pop()[0] if self._idle else None
+            self._in_use += 1
+            self.stats["checkouts"] += 1
+
+        try:
+            if conn is not None and not self._is_alive(conn):
+                self._close(conn)
+                conn = None
+                with self._cond:
+                    self.stats["reconnects"] += 1
+            if conn is None:
+                conn = self.factory()
+                with self._cond:
+                    self.stats["created"] += 1
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return conn
+
+    def release(self, conn, broken=False):
+        """Return a connection to the pool; broken connections are closed instead."""
+        with self._cond:
+            self._in_use -= 1
+            if broken:
+                self._close(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except pyodbc.Error:
+            # The session may have dropped mid-query; don't hand it out again
+            broken = True
+            raise
+        finally:
+            self.release(conn, broken=broken)
+
+    def get_stats(self):
+        with self._cond:
+            stats = dict(self.stats)
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._in_use
+            stats["max_size"] = self.max_size
+        return stats
+
+    def close_all(self):
+        with self._cond:
+            for conn, _ in self._idle:
+                self._close(conn)
+            self._idle = []
+
+
+_pool = ConnectionPool()
+
+
+def get_pool():
+    return _pool
+
+
+def get_pool_stats():
+    """Return checkout/wait/reconnect counters of the shared connection pool."""
+    return _pool.get_stats()
+
+
+# Optional local SQLite replica (models/local_replica.py); reads prefer it once synced
+_replica = None
+
+
+def set_replica(replica):
+    global _replica
+    _replica = replica
+
+
+def get_replica():
+    return _replica
+
+
 def get_user_wo_numbers(waan_sa: str):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(f'''
-        SELECT DISTINCT WADOCO
-        FROM {SCHEMA}.{TABLE}
-        WHERE WAANSA = ? AND WASRST IN (36, 48, 50)
-        ORDER BY WADOCO DESC
-    ''', (waan_sa,))
-    result = [row.WADOCO for row in cursor.fetchall()]
-    conn.close()
+    if _replica is not None and _replica.has_user(waan_sa):
+        return _replica.get_user_wo_numbers(waan_sa)
+    with _pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT DISTINCT WADOCO
+            FROM {SCHEMA}.{TABLE}
+            WHERE WAANSA = ? AND WASRST IN (36, 48, 50)
+            ORDER BY WADOCO DESC
+        ''', (waan_sa,))
+        result = [row.WADOCO for row in cursor.fetchall()]
+        cursor.close()
     return result
 
-def get_wo_e_number_and_model(wo_number: str):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(f'''
-        SELECT WMLOTN, WADL01
-        FROM {SCHEMA}.{TABLE}
-        WHERE WADOCO = ?
-    ''', (wo_number,))
+def _parse_wo_rows(rows):
     e_number = None
     model = None
-    for row in cursor.fetchall():
+    for row in rows:
         if row.WMLOTN:
             val = str(row.WMLOTN)
             if val.startswith(('E', 'E-', 'F', 'F-')):
@@ -44,18 +195,70 @@ def get_wo_e_number_and_model(wo_number: str):
             if 'IND.ROBOT' in model:
                 model = model.replace('IND.ROBOT', '').strip()
                 model = re.sub(r'^[-\s]+', '', model)
-    conn.close()
     return {"e_number": e_number, "model": model}
 
+def get_wo_e_number_and_model(wo_number: str):
+    if _replica is not None:
+        details = _replica.get_wo_details(wo_number)
+        if details is not None:
+            return details
+    with _pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT WMLOTN, WADL01
+            FROM {SCHEMA}.{TABLE}
+            WHERE WADOCO = ?
+        ''', (wo_number,))
+        rows = cursor.fetchall()
+        cursor.close()
+    return _parse_wo_rows(rows)
+
+def get_wo_details_bulk(wo_numbers, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Resolve E-number and model for many WO numbers with one query per chunk.
+    Returns {wo_number: {"e_number": ..., "model": ...}}; WOs without rows map to None values.
+    """
+    wanted = []
+    for wo in wo_numbers:
+        wo = str(wo).strip()
+        if wo and wo not in wanted:
+            wanted.append(wo)
+    result = {}
+    if _replica is not None:
+        for wo in wanted:
+            details = _replica.get_wo_details(wo)
+            if details is not None:
+                result[wo] = details
+        wanted = [wo for wo in wanted if wo not in result]
+    if not wanted:
+        return result
+    rows_by_wo = {wo: [] for wo in wanted}
+    with _pool.connection() as conn:
+        cursor = conn.cursor()
+        for start in range(0, len(wanted), chunk_size):
+            chunk = wanted[start:start + chunk_size]
+            placeholders = ', '.join('?' for _ in chunk)
+            cursor.execute(f'''
+                SELECT WADOCO, WMLOTN, WADL01
+                FROM {SCHEMA}.{TABLE}
+                WHERE WADOCO IN ({placeholders})
+            ''', chunk)
+            for row in cursor.fetchall():
+                rows_by_wo.setdefault(str(row.WADOCO).strip(), []).append(row)
+        cursor.close()
+    for wo in wanted:
+        result[wo] = _parse_wo_rows(rows_by_wo.get(wo, []))
+    return result
+
 if __name__ == "__main__":
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(f'SELECT TOP 5 * FROM {SCHEMA}.{TABLE}')
-        columns = [column[0] for column in cursor.description]
-        print(columns)
-        for row in cursor.fetchall():
-            print(row)
-        conn.close()
+        with _pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT TOP 5 * FROM {SCHEMA}.{TABLE}')
+            columns = [column[0] for column in cursor.description]
+            print(columns)
+            for row in cursor.fetchall():
+                print(row)
+        print(get_pool_stats())
     except Exception as e:
         print(f"Ошибка подключения или запроса: {e}")
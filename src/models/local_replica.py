@@ -0,0 +1,190 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+
+from config import get_app_data_path
+from models import db_connector
+from models.db_connector import SCHEMA, TABLE, _parse_wo_rows
+
+REPLICA_FILE = 'parts_list_replica.sqlite'
+DEFAULT_SYNC_INTERVAL = 300  # seconds
+ACTIVE_STATUSES = (36, 48, 50)
+
+
+class _Row:
+    # Attribute access like pyodbc rows so _parse_wo_rows can be shared
+    __slots__ = ("WMLOTN", "WADL01")
+
+    def __init__(self, wmlotn, wadl01):
+        self.WMLOTN = wmlotn
+        self.WADL01 = wadl01
+
+
+class LocalReplica:
+    """
+    Local SQLite copy of the PartsList_Robotics columns the app uses.
+
+    Rows are synced per SSO in the background: each pass pulls the user's rows
+    from SQL Server and rewrites only the WOs whose rows changed. Reads are
+    served from SQLite once an SSO has been synced, so they work offline.
+    """
+
+    def __init__(self, db_path=None, sync_interval=DEFAULT_SYNC_INTERVAL):
+        self.db_path = db_path or os.path.join(get_app_data_path(), REPLICA_FILE)
+        self.sync_interval = sync_interval
+        self._write_lock = threading.Lock()
+        self._ssos = set()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self.stats = {"syncs": 0, "sync_errors": 0, "rows_changed": 0, "reads": 0}
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    @contextmanager
+    def _connection(self):
+        """Connection that commits (or rolls back) and is closed afterwards"""
+        with closing(self._connect()) as conn, conn:
+            yield conn
+
+    def _count(self, key, n=1):
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def _init_db(self):
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._write_lock, self._connection() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS parts_list (
+                    WADOCO TEXT NOT NULL,
+                    WAANSA TEXT,
+                    WASRST INTEGER,
+                    WMLOTN TEXT,
+                    WADL01 TEXT
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_parts_wadoco ON parts_list (WADOCO)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_parts_waansa ON parts_list (WAANSA, WASRST)')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    sso TEXT PRIMARY KEY,
+                    last_sync REAL NOT NULL
+                )
+            ''')
+
+    # --- reads ---
+
+    def has_user(self, sso):
+        with self._connection() as conn:
+            row = conn.execute('SELECT 1 FROM sync_state WHERE sso = ?', (sso,)).fetchone()
+        return row is not None
+
+    def get_user_wo_numbers(self, sso):
+        placeholders = ', '.join('?' for _ in ACTIVE_STATUSES)
+        with self._connection() as conn:
+            rows = conn.execute(f'''
+                SELECT DISTINCT WADOCO FROM parts_list
+                WHERE WAANSA = ? AND WASRST IN ({placeholders})
+                ORDER BY WADOCO DESC
+            ''', (sso, *ACTIVE_STATUSES)).fetchall()
+        self._count("reads")
+        return [row[0] for row in rows]
+
+    def get_wo_details(self, wo_number):
+        """Return {"e_number", "model"} for a replicated WO, or None if the WO is unknown"""
+        with self._connection() as conn:
+            rows = conn.execute(
+                'SELECT WMLOTN, WADL01 FROM parts_list WHERE WADOCO = ?', (str(wo_number),)
+            ).fetchall()
+        self._count("reads")
+        if not rows:
+            return None
+        return _parse_wo_rows([_Row(*row) for row in rows])
+
+    # --- sync ---
+
+    def _fetch_remote(self, sso):
+        with db_connector.get_pool().connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT WADOCO, WAANSA, WASRST, WMLOTN, WADL01
+                FROM {SCHEMA}.{TABLE}
+                WHERE WAANSA = ?
+            ''', (sso,))
+            rows = cursor.fetchall()
+            cursor.close()
+        by_wo = {}
+        for row in rows:
+            wo = str(row.WADOCO).strip()
+            by_wo.setdefault(wo, []).append((
+                wo,
+                str(row.WAANSA).strip() if row.WAANSA is not None else None,
+                int(row.WASRST) if row.WASRST is not None else None,
+                str(row.WMLOTN) if row.WMLOTN is not None else None,
+                str(row.WADL01) if row.WADL01 is not None else None,
+            ))
+        return by_wo
+
+    def sync_user(self, sso):
+        """Pull the user's rows from SQL Server and rewrite only WOs that changed"""
+        remote = self._fetch_remote(sso)
+        changed = 0
+        with self._write_lock, self._connection() as conn:
+            local = {}
+            for row in conn.execute(
+                'SELECT WADOCO, WAANSA, WASRST, WMLOTN, WADL01 FROM parts_list WHERE WAANSA = ?', (sso,)
+            ):
+                local.setdefault(row[0], []).append(tuple(row))
+            for wo in set(local) - set(remote):
+                conn.execute('DELETE FROM parts_list WHERE WADOCO = ? AND WAANSA = ?', (wo, sso))
+                changed += 1
+            for wo, rows in remote.items():
+                if sorted(local.get(wo, []), key=repr) == sorted(rows, key=repr):
+                    continue
+                conn.execute('DELETE FROM parts_list WHERE WADOCO = ? AND WAANSA = ?', (wo, sso))
+                conn.executemany('INSERT INTO parts_list VALUES (?, ?, ?, ?, ?)', rows)
+                changed += 1
+            conn.execute(
+                'INSERT OR REPLACE INTO sync_state (sso, last_sync) VALUES (?, ?)', (sso, time.time())
+            )
+        self._count("syncs")
+        self._count("rows_changed", changed)
+        return changed
+
+    def track_user(self, sso):
+        """Add an SSO to the background sync set and start the sync thread"""
+        self._ssos.add(sso)
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            for sso in list(self._ssos):
+                try:
+                    self.sync_user(sso)
+                except Exception as ex:
+                    self._count("sync_errors")
+                    print(f"Local replica sync error for {sso}: {ex}")
+            self._stop.wait(self.sync_interval)
+
+    def get_sync_lag(self, sso):
+        """Seconds since the last successful sync of SSO, or None if never synced"""
+        with self._connection() as conn:
+            row = conn.execute('SELECT last_sync FROM sync_state WHERE sso = ?', (sso,)).fetchone()
+        return time.time() - row[0] if row else None
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["sync_lag"] = {sso: self.get_sync_lag(sso) for sso in list(self._ssos)}
+        return stats
@@ -0,0 +1,102 @@
+import json
+import os
+import threading
+
+COMPACT_EVERY = 500  # journal records between snapshot rewrites
+JOURNAL_SUFFIX = ".journal"
+
+
+class SpotStateJournal:
+    """
+    Write-ahead journal for spots_state.json.
+
+    Every change appends one fsync'd JSON line per modified spot
+    ({"station": "1", "spot": "1_3", "state": {...}}) instead of rewriting the
+    whole file. The snapshot is rewritten atomically on compact(); records are
+    full spot states, so replaying a journal over a newer snapshot is harmless.
+    """
+
+    def __init__(self, snapshot_path, journal_path=None, compact_every=COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._file = None
+        self.records = 0  # records in the journal since the last compaction
+        self.stats = {"appends": 0, "bytes": 0, "compactions": 0, "replayed": 0}
+
+    def load(self, snapshot_path=None):
+        """Snapshot state with the journal replayed on top: {station: {spot_id: state}}"""
+        state = {}
+        path = snapshot_path or self.snapshot_path
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        replayed = 0
+        lines = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn last line from a crash mid-append
+                        print(f"Skipping damaged spot journal record in {self.journal_path}")
+                        continue
+                    state.setdefault(record["station"], {})[record["spot"]] = record["state"]
+                    replayed += 1
+        with self._lock:
+            # Damaged lines count too, so the caller compacts them away before appending
+            self.records = lines
+            self.stats["replayed"] = replayed
+        return state
+
+    def append(self, changes):
+        """Journal [(station_id, spot_id, state)]; returns True when a compaction is due"""
+        if not changes:
+            return False
+        data = "".join(
+            json.dumps({"station": str(station_id), "spot": spot_id, "state": state}) + "\n"
+            for station_id, spot_id, state in changes
+        ).encode("utf-8")
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+                self._file = open(self.journal_path, "ab")
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.records += len(changes)
+            self.stats["appends"] += 1
+            self.stats["bytes"] += len(data)
+            return self.records >= self.compact_every
+
+    def compact(self, state):
+        """Atomically rewrite the snapshot with state, then empty the journal"""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            # Truncate only after the snapshot is durable
+            if os.path.exists(self.journal_path):
+                open(self.journal_path, "wb").close()
+            self.records = 0
+            self.stats["compactions"] += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, pending_records=self.records)
@@ -0,0 +1,77 @@
+import time
+
+
+class SpotState:
+    """
+    Timer/status/WO state of one spot. Slotted, so hundreds of stations cost
+    a few fixed-size objects instead of one dict each. The status is kept as
+    an index into config.get_spot_statuses(); records on disk keep the name.
+    """
+
+    __slots__ = ("status_index", "start_time", "elapsed_time", "running", "wo_number")
+
+    def __init__(self, status_index=0, start_time=0.0, elapsed_time=0.0, running=False, wo_number=""):
+        self.status_index = status_index
+        self.start_time = start_time
+        self.elapsed_time = elapsed_time
+        self.running = running
+        self.wo_number = wo_number
+
+    def elapsed(self, now=None):
+        """Stored elapsed_time plus the running time since start_time"""
+        if self.running and self.start_time:
+            return self.elapsed_time + (now or time.time()) - self.start_time
+        return self.elapsed_time
+
+    def to_record(self, status_names):
+        """Persisted form: {"wo_number", "elapsed_time", "running", "status", "start_time"}"""
+        return {
+            "wo_number": self.wo_number,
+            "elapsed_time": self.elapsed_time,
+            "running": self.running,
+            "status": status_names[self.status_index],
+            "start_time": self.start_time,
+        }
+
+    def snapshot(self, status_names):
+        """Record with elapsed_time computed for now, as handed to views"""
+        record = self.to_record(status_names)
+        record["elapsed_time"] = self.elapsed()
+        return record
+
+    @classmethod
+    def from_record(cls, record, status_index):
+        """Build from a persisted record; status_index maps name -> index, unknown names get 0"""
+        return cls(
+            status_index.get(record.get("status"), 0),
+            record.get("start_time", 0.0) or 0.0,
+            record.get("elapsed_time", 0) or 0,
+            bool(record.get("running", False)),
+            record.get("wo_number", "") or "",
+        )
+
+
+def place_key(station_id):
+    """Record key of a station's dashboard position, stored next to its spots"""
+    return f"station_{station_id}"
+
+
+class StationPlace:
+    """Dashboard position of a station"""
+
+    __slots__ = ("x", "y")
+
+    def __init__(self, x=0, y=0):
+        self.x = x
+        self.y = y
+
+    def to_record(self):
+        return {"place": {"x": self.x, "y": self.y}}
+
+    @classmethod
+    def from_record(cls, record):
+        """StationPlace from a persisted record, or None if it has no place"""
+        place = record.get("place")
+        if not isinstance(place, dict):
+            return None
+        return cls(place.get("x", 0) or 0, place.get("y", 0) or 0)
@@ -0,0 +1,191 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+
+from models.spot_journal import SpotStateJournal
+
+BACKEND_JSON = "json"
+BACKEND_SQLITE = "sqlite"
+STATE_BACKENDS = (BACKEND_JSON, BACKEND_SQLITE)
+SQLITE_SUFFIX = ".sqlite"
+
+_COLUMNS = ("wo_number", "elapsed_time", "running", "status", "start_time")
+
+
+class SQLiteStateStore:
+    """
+    Spot state in SQLite, one row per spot, indexed by station. Each write
+    upserts only the changed rows, so cost doesn't grow with the number of
+    stations. Same interface as SpotStateJournal: load/append/compact/close.
+    Station dashboard positions ({"place": {...}} records) go to station_place.
+
+    On first load the existing spots_state.json (and its journal) is imported
+    once; the JSON files are left in place so the json backend still works.
+    """
+
+    _UPSERT = (
+        'INSERT OR REPLACE INTO spot_state (station, spot_id, wo_number, elapsed_time, running, status, start_time) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)'
+    )
+    _UPSERT_PLACE = 'INSERT OR REPLACE INTO station_place (station, place_key, x, y) VALUES (?, ?, ?, ?)'
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._write_lock = threading.Lock()
+        self.records = 0  # nothing to compact; kept for interface parity
+        self.stats = {"appends": 0, "rows_written": 0, "compactions": 0, "migrated": 0}
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    @contextmanager
+    def _connection(self):
+        """Connection that commits (or rolls back) and is closed afterwards"""
+        with closing(self._connect()) as conn, conn:
+            yield conn
+
+    def _init_db(self):
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with self._write_lock, self._connection() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS spot_state (
+                    station TEXT NOT NULL,
+                    spot_id TEXT NOT NULL,
+                    wo_number TEXT,
+                    elapsed_time REAL,
+                    running INTEGER,
+                    status TEXT,
+                    start_time REAL,
+                    PRIMARY KEY (station, spot_id)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_spot_state_station ON spot_state (station)')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS station_place (
+                    station TEXT PRIMARY KEY,
+                    place_key TEXT NOT NULL,
+                    x REAL,
+                    y REAL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS store_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+
+    def _is_migrated(self, conn):
+        return conn.execute("SELECT 1 FROM store_meta WHERE key = 'migrated_from'").fetchone() is not None
+
+    def migrate_from_json(self, json_path):
+        """One-time import of spots_state.json plus its journal; returns rows imported"""
+        with self._write_lock, self._connection() as conn:
+            if self._is_migrated(conn):
+                return 0
+            state = {}
+            if os.path.exists(json_path) or os.path.exists(SpotStateJournal(json_path).journal_path):
+                try:
+                    state = SpotStateJournal(json_path).load()
+                except (OSError, ValueError) as e:
+                    print(f"Error reading {json_path} for migration: {e}")
+                    return 0
+            rows = self._write(conn, self._changes(state))
+            conn.execute(
+                'INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)',
+                ('migrated_from', f"{json_path}|{time.time()}")
+            )
+        self.stats["migrated"] = rows
+        if rows:
+            print(f"Migrated {rows} spot states from {json_path} to {self.db_path}")
+        return rows
+
+    @staticmethod
+    def _changes(state):
+        return [(station, spot_id, spot) for station, spots in state.items() for spot_id, spot in spots.items()]
+
+    def _write(self, conn, changes):
+        """Upsert changes into spot_state / station_place; returns the rows written"""
+        rows, places = [], []
+        for station_id, spot_id, state in changes:
+            if "place" in state:
+                place = state["place"] or {}
+                places.append((str(station_id), spot_id, place.get("x", 0), place.get("y", 0)))
+            else:
+                rows.append(self._row(station_id, spot_id, state))
+        conn.executemany(self._UPSERT, rows)
+        conn.executemany(self._UPSERT_PLACE, places)
+        return len(rows) + len(places)
+
+    @staticmethod
+    def _row(station_id, spot_id, state):
+        return (
+            str(station_id), spot_id,
+            state.get("wo_number", ""), state.get("elapsed_time", 0), int(bool(state.get("running", False))),
+            state.get("status"), state.get("start_time", 0.0),
+        )
+
+    def load(self, legacy_json_path=None):
+        """{station: {spot_id: state}}; imports legacy_json_path on first use"""
+        if legacy_json_path:
+            self.migrate_from_json(legacy_json_path)
+        state = {}
+        with self._connection() as conn:
+            for row in conn.execute(f'SELECT station, spot_id, {", ".join(_COLUMNS)} FROM spot_state'):
+                record = dict(zip(_COLUMNS, row[2:]))
+                record["running"] = bool(record["running"])
+                if record["status"] is None:
+                    del record["status"]
+                state.setdefault(row[0], {})[row[1]] = record
+            for station, key, x, y in conn.execute('SELECT station, place_key, x, y FROM station_place'):
+                state.setdefault(station, {})[key] = {"place": {"x": x, "y": y}}
+        return state
+
+    def load_station(self, station_id):
+        """{spot_id: state} of one station, via the station index"""
+        with self._connection() as conn:
+            rows = conn.execute(
+                f'SELECT spot_id, {", ".join(_COLUMNS)} FROM spot_state WHERE station = ?', (str(station_id),)
+            ).fetchall()
+            place = conn.execute(
+                'SELECT place_key, x, y FROM station_place WHERE station = ?', (str(station_id),)
+            ).fetchone()
+        spots = {row[0]: dict(zip(_COLUMNS, row[1:]), running=bool(row[3])) for row in rows}
+        if place is not None:
+            spots[place[0]] = {"place": {"x": place[1], "y": place[2]}}
+        return spots
+
+    def append(self, changes):
+        """Upsert [(station_id, spot_id, state)]; never asks for compaction"""
+        if not changes:
+            return False
+        with self._write_lock, self._connection() as conn:
+            written = self._write(conn, changes)
+        self.stats["appends"] += 1
+        self.stats["rows_written"] += written
+        return False
+
+    def compact(self, state):
+        """Write the full state in one transaction"""
+        with self._write_lock, self._connection() as conn:
+            self._write(conn, self._changes(state))
+        self.stats["compactions"] += 1
+
+    def close(self):
+        pass
+
+    def get_stats(self):
+        return dict(self.stats)
+
+
+def create_state_store(backend, state_file):
+    """Storage for spot state: 'json' (spots_state.json + journal) or 'sqlite'"""
+    if backend == BACKEND_SQLITE:
+        return SQLiteStateStore(os.path.splitext(state_file)[0] + SQLITE_SUFFIX)
+    if backend != BACKEND_JSON:
+        print(f"Unknown state backend '{backend}', using {BACKEND_JSON}")
+    return SpotStateJournal(state_file)
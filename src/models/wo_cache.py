@@ -0,0 +1,177 @@
+import threading
+import time
+from collections import OrderedDict
+
+from models.db_connector import get_user_wo_numbers, get_wo_e_number_and_model, get_wo_details_bulk
+
+# Defaults, overridable through "cache_settings" in config.json
+DEFAULT_CACHE_SETTINGS = {
+    "wo_list_ttl": 120,        # seconds a WO list is considered fresh
+    "wo_details_ttl": 3600,    # seconds E-number/model of a WO is considered fresh
+    "stale_ttl": 86400,        # how long past TTL a stale entry may still be served
+    "max_entries": 512,
+}
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    LRU cache with per-entry TTL and stale-while-revalidate.
+
+    Fresh entries are returned directly. Stale entries (older than ttl but younger
+    than ttl + stale_ttl) are returned immediately while a background thread
+    reloads them. Missing or expired entries are loaded synchronously.
+    """
+
+    def __init__(self, loader, ttl, stale_ttl, max_entries):
+        self.loader = loader
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+
+    def get_cached(self, key, default=None):
+        """
+        Fresh or stale value (stale ones are reloaded in the background), or
+        default for missing and expired entries; never loads synchronously.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                age = now - stored_at
+                if age <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return value
+                if age <= self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stats["stale_hits"] += 1
+                    self._schedule_refresh(key)
+                    return value
+            self.stats["misses"] += 1
+        return default
+
+    def get(self, key):
+        value = self.get_cached(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = self.loader(key)
+        self.put(key, value)
+        return value
+
+    def peek(self, key):
+        """Return the cached value regardless of age, or None, without loading"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _schedule_refresh(self, key):
+        # Caller must hold self._lock
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        threading.Thread(target=self._refresh, args=(key,), daemon=True).start()
+
+    def _refresh(self, key):
+        try:
+            value = self.loader(key)
+            self.put(key, value)
+            with self._lock:
+                self.stats["refreshes"] += 1
+        except Exception as ex:
+            with self._lock:
+                self.stats["refresh_errors"] += 1
+            print(f"Cache refresh error for {key}: {ex}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+        return stats
+
+
+_settings = dict(DEFAULT_CACHE_SETTINGS)
+_wo_lists = TTLCache(get_user_wo_numbers, _settings["wo_list_ttl"], _settings["stale_ttl"], _settings["max_entries"])
+_wo_details = TTLCache(get_wo_e_number_and_model, _settings["wo_details_ttl"], _settings["stale_ttl"], _settings["max_entries"])
+
+
+def configure_cache(settings):
+    """Apply "cache_settings" from config.json to the shared caches"""
+    _settings.update(settings or {})
+    _wo_lists.ttl = _settings["wo_list_ttl"]
+    _wo_details.ttl = _settings["wo_details_ttl"]
+    for cache in (_wo_lists, _wo_details):
+        cache.stale_ttl = _settings["stale_ttl"]
+        cache.max_entries = _settings["max_entries"]
+
+
+def get_cached_user_wo_numbers(sso: str):
+    return _wo_lists.get(sso)
+
+
+def peek_cached_user_wo_numbers(sso: str):
+    """Cached WO list of any age, or None; never queries the database"""
+    return _wo_lists.peek(sso)
+
+
+def refresh_user_wo_numbers(sso: str):
+    """Reload the WO list from the database and store it, bypassing the TTL"""
+    wo_numbers = get_user_wo_numbers(sso)
+    _wo_lists.put(sso, wo_numbers)
+    return wo_numbers
+
+
+def get_cached_wo_details(wo_number: str):
+    return _wo_details.get(wo_number)
+
+
+def get_cached_wo_details_many(wo_numbers):
+    """Serve cached WO details; missing and expired ones are fetched in one bulk query"""
+    result = {}
+    missing = []
+    for wo in wo_numbers:
+        cached = _wo_details.get_cached(wo, _MISSING)
+        if cached is not _MISSING:
+            result[wo] = cached
+        else:
+            missing.append(wo)
+    if missing:
+        for wo, details in get_wo_details_bulk(missing).items():
+            _wo_details.put(wo, details)
+            result[wo] = details
+    return result
+
+
+def invalidate_user_wo_numbers(sso=None):
+    _wo_lists.invalidate(sso)
+
+
+def invalidate_wo_details(wo_number=None):
+    _wo_details.invalidate(wo_number)
+
+
+def get_cache_stats():
+    return {"wo_lists": _wo_lists.get_stats(), "wo_details": _wo_details.get_stats()}
@@ -0,0 +1,79 @@
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from controllers.dt_workbook import ENGINE_AUTO, ENGINE_COM, WorkbookSession
+
+VALUES = [-129992, -1860567, -16120680, 23682555, 0, 0, 0, 0, 0]
+
+
+def make_templates(folder):
+    """Small DT-like templates with a styled F22..F30 block"""
+    import openpyxl
+    from openpyxl.styles import Font
+    import xlwt
+
+    xlsx_path = os.path.join(folder, "DT_template.xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws["A1"] = "Data sheet"
+    for row in range(22, 31):
+        ws.cell(row=row, column=5, value=f"J{row - 21}")
+        ws.cell(row=row, column=6, value=0).font = Font(bold=True)
+    wb.save(xlsx_path)
+
+    xls_path = os.path.join(folder, "DT_template.xls")
+    wb = xlwt.Workbook()
+    ws = wb.add_sheet("DT")
+    bold = xlwt.easyxf("font: bold on")
+    ws.write(0, 0, "Data sheet")
+    for row in range(21, 30):
+        ws.write(row, 4, f"J{row - 20}")
+        ws.write(row, 5, 0, bold)
+    wb.save(xls_path)
+    return [xlsx_path, xls_path]
+
+
+def bench(engine, dt_path, runs, target_dir):
+    """Per-DT write latencies in ms; the first write includes engine startup"""
+    timings = []
+    with WorkbookSession(engine) as session:
+        for _ in range(runs):
+            start = time.perf_counter()
+            session.write_dt(dt_path, VALUES, target_dir)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-DT latency of the workbook writers")
+    parser.add_argument("templates", nargs="*", help="DT files to write (default: generated samples)")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--com", action="store_true", help="also time the Excel COM engine")
+    args = parser.parse_args()
+
+    engines = [ENGINE_AUTO] + ([ENGINE_COM] if args.com else [])
+    with tempfile.TemporaryDirectory() as folder:
+        templates = [os.path.abspath(t) for t in args.templates] or make_templates(folder)
+        out_dir = os.path.join(folder, "out")
+        os.makedirs(out_dir)
+        print(f"{'engine':6} {'file':28} {'first ms':>9} {'median ms':>10} {'mean ms':>9}")
+        for engine in engines:
+            for dt_path in templates:
+                try:
+                    timings = bench(engine, dt_path, args.runs, out_dir)
+                except Exception as e:
+                    print(f"{engine:6} {os.path.basename(dt_path):28} error: {e}")
+                    continue
+                print(f"{engine:6} {os.path.basename(dt_path):28} {timings[0]:9.1f} "
+                      f"{statistics.median(timings):10.1f} {statistics.mean(timings):9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import os
+import re
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from controllers.sv_reader import SVImage
+
+FIXTURE_DIR = os.path.join(BASE_DIR, 'utils', 'WinOLPC', 'bin', 'Robot_1', 'temp')
+# (binary file, kconvars text output of the same file)
+DEFAULT_FIXTURES = [
+    (os.path.join(FIXTURE_DIR, 'SYSMAST.SV'), os.path.join(FIXTURE_DIR, 'sysmast.svs')),
+]
+FIELDS = ["$MASTER_COUN", "$REF_COUNT"]
+
+_field_header = re.compile(r"Field: (\$\w+)\[(\d+)\]\.(\$\w+)\s+ARRAY\[(\d+)\] OF INTEGER")
+_array_value = re.compile(r"\[\d+\]\s*=\s*(-?\d+)")
+
+
+def read_text_arrays(txt_path):
+    """{(var, index, field): [values]} for every INTEGER array field in a kconvars dump"""
+    arrays = {}
+    with open(txt_path, encoding="utf-8", errors="ignore") as f:
+        lines = f.readlines()
+    for i, line in enumerate(lines):
+        match = _field_header.search(line)
+        if not match:
+            continue
+        var, index, field, size = match.group(1), int(match.group(2)), match.group(3), int(match.group(4))
+        values = []
+        for value_line in lines[i + 1:i + 1 + size]:
+            value = _array_value.search(value_line)
+            if value:
+                values.append(int(value.group(1)))
+        arrays[(var, index, field)] = values
+    return arrays
+
+
+def crosscheck(sv_path, txt_path):
+    """Compare native reads against the kconvars text; returns number of mismatches"""
+    image = SVImage.from_path(sv_path)
+    expected = read_text_arrays(txt_path)
+    failures = 0
+    for (var, index, field), values in sorted(expected.items()):
+        if var != "$DMR_GRP" or field not in FIELDS:
+            continue
+        try:
+            native = image.read_int_array(var, index, field)
+        except Exception as e:
+            native = f"error: {e}"
+        status = "OK" if native == values else "MISMATCH"
+        if status != "OK":
+            failures += 1
+        print(f"{status:8} {os.path.basename(sv_path)} {var}[{index}].{field} native={native} kconvars={values}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-check the native sysmast.sv reader against kconvars output")
+    parser.add_argument("pairs", nargs="*", metavar="SV,TXT", help="binary file and its kconvars text dump")
+    parser.add_argument("--kconvars", action="store_true",
+                        help="convert each SV with kconvars instead of reading an existing text dump")
+    args = parser.parse_args()
+
+    fixtures = [tuple(pair.split(",", 1)) for pair in args.pairs] or DEFAULT_FIXTURES
+    failures = 0
+    for sv_path, txt_path in fixtures:
+        if args.kconvars:
+            from controllers.dt_generator import convert_sysmast
+            txt_path, error = convert_sysmast(sv_path)
+            if error:
+                print(f"SKIP     {sv_path}: {error}")
+                continue
+        failures += crosscheck(sv_path, txt_path)
+    print("All values match" if not failures else f"{failures} mismatch(es)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import xlrd
+import xlwt
+
+from controllers import dt_workbook
+from controllers.dt_workbook import LOST_FORMULAS, ComWriter, WorkbookSession, XlsWriter
+
+VALUES = [-129992, -1860567, -16120680, 23682555, 0, 0, 0, 0, 0]
+
+
+def make_xls(path, formula=False):
+    """DT-like .xls template; with formula, G22 derives from F22"""
+    wb = xlwt.Workbook()
+    ws = wb.add_sheet("DT")
+    ws.write(0, 0, "Data sheet")
+    for row in range(21, 30):
+        ws.write(row, 4, f"J{row - 20}")
+        ws.write(row, 5, 0)
+    if formula:
+        ws.write(21, 6, xlwt.Formula("F22*2"))
+    wb.save(path)
+    return path
+
+
+class XlsFormulaRoutingTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.target = os.path.join(self.tmp.name, "out")
+        os.mkdir(self.target)
+
+    def com_available(self, available):
+        patcher = mock.patch.object(dt_workbook, "_com_available", return_value=available)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_plain_template_is_written_in_process(self):
+        dt_path = make_xls(os.path.join(self.tmp.name, "plain.xls"))
+        self.assertEqual(XlsWriter.lost_content(dt_path), set())
+        self.com_available(False)
+        with WorkbookSession() as session:
+            save_path = session.write_dt(dt_path, VALUES, self.target)
+        sheet = xlrd.open_workbook(save_path).sheet_by_index(0)
+        self.assertEqual(sheet.col_values(5, 21, 30), VALUES)
+
+    def test_formula_template_is_detected(self):
+        dt_path = make_xls(os.path.join(self.tmp.name, "formula.xls"), formula=True)
+        self.assertEqual(XlsWriter.lost_content(dt_path), {LOST_FORMULAS})
+
+    def test_formula_template_goes_to_com(self):
+        dt_path = make_xls(os.path.join(self.tmp.name, "formula.xls"), formula=True)
+        self.com_available(True)
+        with WorkbookSession() as session:
+            self.assertIsInstance(session._writer_for(dt_path), ComWriter)
+
+    def test_formula_template_without_com_fails(self):
+        dt_path = make_xls(os.path.join(self.tmp.name, "formula.xls"), formula=True)
+        self.com_available(False)
+        with WorkbookSession() as session, self.assertRaises(RuntimeError):
+            session.write_dt(dt_path, VALUES, self.target)
+        self.assertEqual(os.listdir(self.target), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
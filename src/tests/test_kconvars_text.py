@@ -0,0 +1,63 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from controllers.kconvars_text import extract_fields, extract_fields_from_file
+
+SAMPLE = """\
+[*SYSTEM*]$LANGUAGE  Storage: CMOS  Access: RW  : STRING[13] = 'DEFAULT     '
+[*SYSTEM*]$DMR_GRP  Storage: SHADOW  Access: RW  : ARRAY[2] OF DMR_GRP_T
+     Field: $DMR_GRP[1].$MASTER_DONE Access: RW: BOOLEAN = TRUE
+     Field: $DMR_GRP[1].$MASTER_COUN  ARRAY[3] OF INTEGER
+      [1] = -129992
+      [2] = 0
+      [3] = 42
+     Field: $DMR_GRP[1].$REF_DONE Access: RW: BOOLEAN = FALSE
+[*SYSTEM*]$SCR_GRP  Storage: SHADOW  Access: RW  : ARRAY[1] OF SCR_GRP_T
+"""
+
+
+class ExtractFieldsTest(unittest.TestCase):
+    def extract(self, names):
+        return extract_fields(io.StringIO(SAMPLE), names)
+
+    def test_scalars(self):
+        self.assertEqual(
+            self.extract(["$LANGUAGE", "$DMR_GRP[1].$REF_DONE"]),
+            {"$LANGUAGE": "DEFAULT     ", "$DMR_GRP[1].$REF_DONE": False},
+        )
+
+    def test_integer_array(self):
+        self.assertEqual(
+            self.extract(["$DMR_GRP[1].$MASTER_COUN"]),
+            {"$DMR_GRP[1].$MASTER_COUN": [-129992, 0, 42]},
+        )
+
+    def test_struct_array_header_keeps_following_field(self):
+        result = self.extract(["$DMR_GRP", "$DMR_GRP[1].$MASTER_DONE"])
+        self.assertEqual(result, {"$DMR_GRP[1].$MASTER_DONE": True})
+
+    def test_array_followed_directly_by_requested_field(self):
+        result = self.extract(["$DMR_GRP[1].$MASTER_COUN", "$DMR_GRP[1].$REF_DONE"])
+        self.assertEqual(result["$DMR_GRP[1].$MASTER_COUN"], [-129992, 0, 42])
+        self.assertIs(result["$DMR_GRP[1].$REF_DONE"], False)
+
+    def test_missing_names_are_left_out(self):
+        self.assertEqual(self.extract(["$SCR_GRP", "$NOPE"]), {})
+
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sysmast.svs")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(SAMPLE)
+            result = extract_fields_from_file(path, ["$DMR_GRP", "$DMR_GRP[1].$MASTER_DONE"])
+        self.assertEqual(result, {"$DMR_GRP[1].$MASTER_DONE": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
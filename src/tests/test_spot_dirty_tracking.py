@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from controllers import station_controller
+from controllers.station_controller import StationController
+from test_station_places import FakeConfig
+
+NEW_SPOTS = 3000
+
+
+class DirtyTrackingRaceTest(unittest.TestCase):
+    def setUp(self):
+        # Switch threads often, so UI inserts land inside the worker's loops
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+        self.data_dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(station_controller, "get_app_data_path", return_value=self.data_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.data_dir.cleanup)
+
+    def test_marks_made_during_writes_are_not_lost(self):
+        controller = StationController(FakeConfig("json"))
+        written = set()
+
+        def append(changes):
+            written.update(spot_id for _, spot_id, _ in changes)
+            return False
+
+        controller.store.append = append
+        compact = controller.store.compact
+        controller.store.compact = lambda state: None
+
+        def ui():
+            # New spots are inserted into spots and marked dirty, as from UI commands
+            for i in range(NEW_SPOTS):
+                controller._get_spot(1, f"1_new{i}")
+
+        thread = threading.Thread(target=ui)
+        thread.start()
+        with mock.patch("builtins.print") as printed:
+            while thread.is_alive():
+                controller.write_spots_state()
+                controller.compact_spots_state()
+            thread.join()
+            controller.write_spots_state()
+
+        printed.assert_not_called()
+        self.assertEqual({f"1_new{i}" for i in range(NEW_SPOTS)} - written, set())
+        controller.store.compact = compact
+        controller.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
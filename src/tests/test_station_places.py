@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from controllers import station_controller
+from controllers.station_controller import StationController
+
+
+class FakeConfig:
+    """Just the settings StationController reads"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def set_controller(self, controller):
+        pass
+
+    def get_app_settings(self):
+        return {"stations": 2, "spots": 2}
+
+    def get_spot_statuses(self):
+        return [{"name": "Unblocked"}, {"name": "In Progress"}]
+
+    def get_status_names(self):
+        return [status["name"] for status in self.get_spot_statuses()]
+
+    def get_persistence_settings(self):
+        return {"debounce_ms": 10, "backend": self.backend}
+
+
+class StationPlaceRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(station_controller, "get_app_data_path", return_value=self.data_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.data_dir.cleanup)
+
+    def _round_trip(self, backend, close):
+        controller = StationController(FakeConfig(backend))
+        controller.set_station_place(1, 120, 80)
+        controller.set_station_place(2, 300, 40)
+        controller.set_wo_number(1, "1_1", "12345678")
+        if close:
+            controller.close()
+        else:
+            # Journal/upsert path only, as after a crash before compaction
+            controller.persistence.flush_now()
+            controller.store.close()
+
+        reloaded = StationController(FakeConfig(backend))
+        self.assertEqual(reloaded.get_station_place(1), (120, 80))
+        self.assertEqual(reloaded.get_station_place(2), (300, 40))
+        self.assertEqual(reloaded.get_spot_data(1, "1_1")["wo_number"], "12345678")
+        reloaded.close()
+
+    def test_json_snapshot(self):
+        self._round_trip("json", close=True)
+
+    def test_json_journal(self):
+        self._round_trip("json", close=False)
+
+    def test_sqlite(self):
+        self._round_trip("sqlite", close=True)
+
+    def test_sqlite_without_compaction(self):
+        self._round_trip("sqlite", close=False)
+
+    def test_set_station_place_marks_dirty(self):
+        controller = StationController(FakeConfig("json"))
+        controller.write_spots_state()
+        controller.set_station_place(1, 10, 20)
+        self.assertIn((1, "station_1"), controller._dirty_spots)
+        controller.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
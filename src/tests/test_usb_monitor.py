@@ -0,0 +1,80 @@
+import os
+import queue
+import sys
+import time
+import unittest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from controllers.usb_monitor import FakeBackend, USBMonitor
+
+STICK_E = ("E:", "E: ROBOT")
+STICK_F = ("F:", "F: BACKUP")
+TIMEOUT = 2
+
+
+class USBMonitorFakeBackendTest(unittest.TestCase):
+    def setUp(self):
+        self.backend = FakeBackend()
+        self.monitor = USBMonitor(lambda: self.backend)
+        self.events = queue.Queue()
+
+    def tearDown(self):
+        if self.monitor.is_running():
+            self.monitor.unsubscribe(self.on_change)
+
+    def on_change(self, drives, added, removed):
+        self.events.put((drives, added, removed))
+
+    def next_event(self):
+        return self.events.get(timeout=TIMEOUT)
+
+    def test_insert_and_remove(self):
+        self.monitor.subscribe(self.on_change, with_changes=True)
+        self.assertEqual(self.next_event(), ([], [], []))
+
+        self.backend.set_drives([STICK_E])
+        self.assertEqual(self.next_event(), ([STICK_E], [STICK_E], []))
+
+        self.backend.set_drives([STICK_E, STICK_F])
+        self.assertEqual(self.next_event(), ([STICK_E, STICK_F], [STICK_F], []))
+
+        self.backend.set_drives([STICK_F])
+        self.assertEqual(self.next_event(), ([STICK_F], [], [STICK_E]))
+        self.assertEqual(self.monitor.get_drives(), [STICK_F])
+
+    def test_unchanged_rescan_is_not_reported(self):
+        self.monitor.subscribe(self.on_change, with_changes=True)
+        self.next_event()
+        self.backend.set_drives([])
+        self.backend.set_drives([STICK_E])
+        self.assertEqual(self.next_event()[1], [STICK_E])
+        self.assertTrue(self.events.empty())
+
+    def test_late_subscriber_gets_current_drives(self):
+        self.backend.drives = [STICK_E]
+        self.monitor.subscribe(self.on_change, with_changes=True)
+        self.next_event()
+
+        late = queue.Queue()
+        self.monitor.subscribe(late.put)
+        self.assertEqual(late.get(timeout=TIMEOUT), [STICK_E])
+        self.monitor.unsubscribe(late.put)
+
+    def test_unsubscribe_does_not_block(self):
+        self.monitor.subscribe(self.on_change, with_changes=True)
+        self.next_event()
+        started = time.monotonic()
+        self.monitor.unsubscribe(self.on_change)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertFalse(self.monitor.is_running())
+
+        # Changes after the last subscriber left are not delivered
+        self.backend.set_drives([STICK_E])
+        with self.assertRaises(queue.Empty):
+            self.events.get(timeout=0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
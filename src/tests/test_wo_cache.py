@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from models import wo_cache
+from models.wo_cache import TTLCache, get_cached_wo_details_many
+
+
+class CountingDB:
+    """Stands in for the per-WO and bulk queries, counting round-trips"""
+
+    def __init__(self):
+        self.single_calls = 0
+        self.bulk_calls = []
+
+    def details(self, wo):
+        self.single_calls += 1
+        return {"e_number": f"E{wo}", "model": "M"}
+
+    def bulk(self, wo_numbers):
+        self.bulk_calls.append(list(wo_numbers))
+        return {wo: {"e_number": f"E{wo}", "model": "M"} for wo in wo_numbers}
+
+
+class WODetailsManyTest(unittest.TestCase):
+    def setUp(self):
+        self.db = CountingDB()
+        self.cache = TTLCache(self.db.details, ttl=10, stale_ttl=10, max_entries=100)
+        for target, value in (("_wo_details", self.cache), ("get_wo_details_bulk", self.db.bulk)):
+            patcher = mock.patch.object(wo_cache, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_cold_cache_is_one_bulk_query(self):
+        wos = [f"{n:08d}" for n in range(50)]
+        result = get_cached_wo_details_many(wos)
+        self.assertEqual(len(result), 50)
+        self.assertEqual(len(self.db.bulk_calls), 1)
+        self.assertEqual(self.db.single_calls, 0)
+
+        get_cached_wo_details_many(wos)
+        self.assertEqual(len(self.db.bulk_calls), 1)  # all fresh now
+
+    def test_expired_entries_join_the_bulk_query(self):
+        expired = [f"{n:08d}" for n in range(20)]
+        fresh = ["99999999"]
+        now = time.monotonic()
+        with mock.patch.object(wo_cache.time, "monotonic", return_value=now - 100):
+            for wo in expired:
+                self.cache.put(wo, {"e_number": "old", "model": "old"})
+        self.cache.put(fresh[0], {"e_number": "E99999999", "model": "M"})
+
+        result = get_cached_wo_details_many(expired + fresh)
+        self.assertEqual(self.db.single_calls, 0)
+        self.assertEqual(self.db.bulk_calls, [expired])
+        self.assertEqual(result[expired[0]]["e_number"], f"E{expired[0]}")
+        self.assertEqual(result[fresh[0]]["e_number"], "E99999999")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -24,20 +24,14 @@ class DashboardView:
 
         stations = []
         for i, station_id in enumerate(station_ids):
-            station_key = f"station_{station_id}"
-            station_data = self.controller.get_spot_data(station_id, station_key)
-            # Initialize place dictionary if it doesn't exist
-            if "place" not in station_data:
-                station_data["place"] = {"x": 0, "y": 0}
-                self.controller.save_spots_state()
-            if station_data["place"]["x"] != 0 or station_data["place"]["y"] != 0:
-                x_pos = station_data["place"]["x"]
-                y_pos = station_data["place"]["y"]
+            place = self.controller.get_station_place(station_id)
+            if place and place != (0, 0):
+                x_pos, y_pos = place
             else:
                 x_pos = 50 + (i % 4) * 150
                 y_pos = 50 + (i // 2) * 100
                 
-                self.controller.set_spot_coordinates(station_id, station_key, x_pos, y_pos)
+                self.controller.set_station_place(station_id, x_pos, y_pos)
             stations.append({
                 "name": f"Station {station_id}",
                 "x": x_pos,
@@ -50,9 +44,8 @@ class DashboardView:
             detector.left = max(0, min(self.page.window.width - detector.content.width, detector.left + e.delta_x))
             detector.top = max(0, min(self.page.window.height - detector.content.height, detector.top + e.delta_y))
             station_id = detector.content.data["id"]
-            station_key = f"station_{station_id}"
             
-            self.controller.set_spot_coordinates(station_id, station_key, detector.left, detector.top)
+            self.controller.set_station_place(station_id, detector.left, detector.top)
             detector.update()
 
         def on_pan_end(self, e: ft.DragEndEvent, station_id):
@@ -1,14 +1,33 @@
 import flet as ft
 import os
 import threading
-import time
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from controllers.timer_component import TimerComponent
+from controllers.ui_updates import call_on_ui, request_update
 from controllers.ro_customization_tools import ROCustomizationController
-from models.db_connector import get_user_wo_numbers, get_wo_e_number_and_model
+from controllers.wo_list_refresher import get_wo_refresher
+from models.wo_cache import get_cached_user_wo_numbers, get_cached_wo_details, peek_cached_user_wo_numbers
 from models.user_model import UserModel
 from styles import BG_CARD, BG_CARD_ALT, BG_STATUS_BAR_DEFAULT, BG_SNACKBAR_SUCCESS, BG_SNACKBAR_ERROR, FONT_SIZE_LARGE, FONT_SIZE_MEDIUM, FONT_SIZE_NORMAL, FONT_SIZE_SMALL, FONT_SIZE_XL, FONT_SIZE_CARD_TITLE, FONT_SIZE_BUTTON, FONT_WEIGHT_BOLD, FONT_WEIGHT_NORMAL, BORDER_RADIUS_MAIN, PADDING_CARD, PADDING_BUTTON, TEXT_DEFAULT, TEXT_SECONDARY, SHADOW_CARD
 
+# Shared worker pool for spot I/O (DB lookups, share listings, USB enumeration)
+_io_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="spot-io")
+
+# In-flight WO list loads, shared by all spots of a station
+_wo_list_loads = {}
+_wo_list_loads_lock = threading.Lock()
+
+
+def _load_user_wo_numbers(sso):
+    """One background load of the user's WO list per SSO at a time"""
+    with _wo_list_loads_lock:
+        future = _wo_list_loads.get(sso)
+        if future is None or future.done():
+            future = _wo_list_loads[sso] = _io_executor.submit(get_cached_user_wo_numbers, sso)
+        return future
+
+
 spot_style: dict = {
     "main": {
         "expand": True,
@@ -21,12 +40,18 @@ spot_style: dict = {
 }
 
 class Spot:
-    def __init__(self, name: str, station_id: str, spot_id: str, page: ft.Page, controller):
+    def __init__(self, name: str, station_id: str, spot_id: str, page: ft.Page, controller, wo_details=None):
         self.name = name
         self.station_id = station_id
         self.spot_id = spot_id
         self.page = page
         self.controller = controller
+        # In-flight WO lookup; results of superseded requests are dropped
+        self._wo_lock = threading.Lock()  # guards _wo_request / _wo_futures
+        self._wo_request = 0
+        self._wo_futures = []
+        # WO -> {"e_number", "model"} prefetched by StationView in one query
+        self.wo_details = wo_details if wo_details is not None else {}
         
         self.timer = None
         try:
@@ -72,7 +97,11 @@ class Spot:
         # Restore WO number if present
         user_model = UserModel()
         current_sso = user_model.get_user_by_windows_login()
-        wo_numbers = get_user_wo_numbers(current_sso)
+        # Never query the DB here; a cold WO list is loaded in the background
+        wo_numbers = peek_cached_user_wo_numbers(current_sso)
+        list_cached = wo_numbers is not None
+        if not list_cached:
+            wo_numbers = []
         saved_wo = spot_data.get("wo_number", "")
         # Новый алгоритм: если сохранённый WO есть в списке с сервера, просто выбрать его, иначе сбросить спот
         if saved_wo and saved_wo in wo_numbers:
@@ -198,6 +227,8 @@ class Spot:
             visible=False,
             font_family="Roboto-Light"
         )
+        self.backup_progress_bar = ft.ProgressBar(width=300, value=0, visible=False)
+        self.backup_progress_text = ft.Text("", size=12, visible=False, font_family="Roboto-Light")
         
         
         self.usb_section = ft.Container(
@@ -215,6 +246,8 @@ class Spot:
                     self.open_orderfil_button,
                     self.move_backups_button
                 ], alignment=ft.MainAxisAlignment.CENTER, wrap=True, spacing=5),
+                self.backup_progress_bar,
+                self.backup_progress_text,
                 
             ]),
             visible=False,
@@ -223,9 +256,6 @@ class Spot:
             border_radius=20,
             margin=ft.margin.only(top=3)        )
         
-        self.usb_detection_active = False
-        self.usb_thread = None
-        
         # Timer and buttons only if self.timer exists and is not None
         timer_controls = []
         if self.timer is not None:
@@ -370,16 +400,13 @@ class Spot:
             shadow=SHADOW_CARD
         )
         
-        if saved_wo and len(saved_wo) == 8:
-            self.wo_number_dropdown.value = saved_wo
-            self.process_wo_number(saved_wo)
-        
         self.update_Color()
         self.timer.on_state_change = self.update_spot_state
         
         
         self.wo_data = {}
         
+        # Restores the saved WO; lookups run in the background
         self.restore_ui_from_state()
 
        
@@ -401,26 +428,39 @@ class Spot:
             content_padding=0
         )
 
-        self._wo_update_thread = threading.Thread(target=self._background_wo_updater, daemon=True)
-        self._wo_update_thread.start()
+        # WO list updates come from the shared app-wide refresher
+        self.current_sso = current_sso
+        get_wo_refresher().subscribe(self.current_sso, self._on_wo_list_refreshed, current=wo_numbers if list_cached else None)
+        if not list_cached:
+            _load_user_wo_numbers(current_sso).add_done_callback(self._on_wo_list_loaded)
 
-    def _background_wo_updater(self):
-        user_model = UserModel()
-        current_sso = user_model.get_user_by_windows_login()
-        prev_wo_numbers = set(opt.key if hasattr(opt, 'key') else str(opt) for opt in (self.wo_number_dropdown.options or []))
-        while True:
-            time.sleep(120) 
-            try:
-                wo_numbers = get_user_wo_numbers(current_sso)
-                new_wo_set = set(str(wo) for wo in wo_numbers)
-                if new_wo_set != prev_wo_numbers:
-                    prev_wo_numbers = new_wo_set
-                    self.wo_number_dropdown.options = [ft.dropdown.Option(str(wo)) for wo in wo_numbers]
-                    if self.wo_number_dropdown.value not in new_wo_set:
-                        self.wo_number_dropdown.value = ""
-                    self.page.update()
-            except Exception as ex:
-                print(f"WO background update error: {ex}")
+    def _on_wo_list_loaded(self, future):
+        """Worker thread: hand the initial WO list to the UI loop"""
+        if future.cancelled() or future.exception() is not None:
+            if not future.cancelled():
+                print(f"WO list load error: {future.exception()}")
+            return
+        call_on_ui(self.page, self.on_wo_list_changed, future.result())
+
+    def _on_wo_list_refreshed(self, wo_numbers):
+        """Refresher thread: the user's WO list changed; apply it on the UI loop"""
+        call_on_ui(self.page, self.on_wo_list_changed, wo_numbers)
+
+    def on_wo_list_changed(self, wo_numbers):
+        """UI loop: show the user's current WO list"""
+        new_wo_set = set(str(wo) for wo in wo_numbers)
+        self.wo_number_dropdown.options = [ft.dropdown.Option(str(wo)) for wo in wo_numbers]
+        if self.wo_number_dropdown.value not in new_wo_set:
+            self.wo_number_dropdown.value = ""
+        request_update(self.page)
+
+    def dispose(self):
+        """Release shared subscriptions when the station view is torn down"""
+        get_wo_refresher().unsubscribe(self.current_sso, self._on_wo_list_refreshed)
+        self.cancel_wo_lookup()
+        self.ro_tools.unregister_usb_detection_callback(self.update_usb_drives_callback)
+        if self.timer:
+            self.timer.dispose()
 
     def restore_ui_from_state(self):
         spot_data = self.controller.get_spot_data(int(self.station_id), self.spot_id)
@@ -450,7 +490,7 @@ class Spot:
         self.update_Color()
         if self.timer:
             self.timer.restore_from_state()
-        self.page.update()
+        request_update(self.page)
 
     def update_status(self, e):
         new_status = e.control.value
@@ -459,9 +499,7 @@ class Spot:
 
     def update_wo_number_from_dropdown(self, e):
         wo_number = e.control.value
-        spot = self.controller.get_spot_data(int(self.station_id), self.spot_id)
-        spot["wo_number"] = wo_number
-        self.controller.save_spots_state()
+        self.controller.set_wo_number(int(self.station_id), self.spot_id, wo_number)
         self.process_wo_number(wo_number)
         
     def process_wo_number(self, wo_number):
@@ -485,12 +523,65 @@ class Spot:
         # Update border based on current state
         self.update_border()
         
+        request = self.cancel_wo_lookup()
         if not wo_number or len(wo_number) != 8 or not wo_number.isdigit():
-            self.page.update()
+            request_update(self.page)
             return
-            
-        # Get e_number and model from the database
-        db_result = get_wo_e_number_and_model(wo_number)
+
+        # Render a loading state right away, then query DB and share concurrently
+        self.e_number_label.value = "E-number: Loading..."
+        self.model_label.value = "Model: Loading..."
+        request_update(self.page)
+
+        prefetched = self.wo_details.get(wo_number)
+        if prefetched is not None:
+            db_future = Future()
+            db_future.set_result(prefetched)
+        else:
+            db_future = _io_executor.submit(get_cached_wo_details, wo_number)
+        file_future = _io_executor.submit(self.ro_tools.search_wo_files, wo_number)
+        with self._wo_lock:
+            if request != self._wo_request:
+                # Superseded while submitting
+                db_future.cancel()
+                file_future.cancel()
+                return
+            self._wo_futures = [db_future, file_future]
+        # Fires once, after both futures are done; results are applied on the UI loop
+        file_future.add_done_callback(
+            lambda _: db_future.add_done_callback(
+                lambda _: call_on_ui(self.page, self._apply_wo_results, request, wo_number, db_future, file_future)
+            )
+        )
+
+    def cancel_wo_lookup(self):
+        """Drop any in-flight WO lookup, e.g. when another WO is picked; returns the new request token"""
+        with self._wo_lock:
+            self._wo_request += 1
+            futures, self._wo_futures = self._wo_futures, []
+            request = self._wo_request
+        for future in futures:
+            future.cancel()
+        return request
+
+    def _apply_wo_results(self, request, wo_number, db_future, file_future):
+        """Runs on the UI loop once both lookups finished"""
+        with self._wo_lock:
+            if request != self._wo_request or db_future.cancelled() or file_future.cancelled():
+                return
+            self._wo_futures = []
+        try:
+            db_result = db_future.result()
+            self.wo_details[wo_number] = db_result
+        except Exception as ex:
+            print(f"WO details lookup error for {wo_number}: {ex}")
+            db_result = {}
+        try:
+            file_result = file_future.result()
+        except Exception as ex:
+            print(f"WO file search error for {wo_number}: {ex}")
+            file_result = {}
+
         e_number_value = db_result.get("e_number") or "Not found"
         model_value = db_result.get("model") or "Unknown"
         self.wo_data["e_number"] = {"e_number": e_number_value, "model": model_value}
@@ -500,8 +591,7 @@ class Spot:
         # --- Update spot card label ---
         self.spot_e_number_label.value = f"{e_number_value} | {model_value}" if e_number_value != "Not found" else ""
         self.spot_e_number_label.visible = e_number_value != "Not found"
-        # --- Get files for robot software section ---
-        file_result = self.ro_tools.search_wo_files(wo_number)
+        # --- Files for robot software section ---
         if file_result.get("dat_file"):
             self.wo_data["dat_file"] = file_result["dat_file"]
         if file_result.get("pdf_file"):
@@ -516,15 +606,24 @@ class Spot:
         self.update_border()
         # --- Update USB section if dialog is already open ---
         if hasattr(self, 'dlg_modal') and getattr(self.dlg_modal, 'open', False):
-            drives = self.ro_tools.get_connected_usb_drives()
-            self.update_usb_drives(drives)
-        self.page.update()
+            self.refresh_usb_drives_async()
+        request_update(self.page)
+
+    def refresh_usb_drives_async(self):
+        """Enumerate USB drives on the I/O pool and apply the result when ready"""
+        future = _io_executor.submit(self.ro_tools.get_connected_usb_drives)
+        future.add_done_callback(
+            lambda f: None if f.cancelled() or f.exception() else self.update_usb_drives_callback(f.result())
+        )
     
     def update_usb_drives_callback(self, drives):
-        """Callback for updating USB drive list"""
+        """USB monitor / I/O pool thread: apply the drive list on the UI loop"""
+        call_on_ui(self.page, self._apply_usb_drives, drives)
+
+    def _apply_usb_drives(self, drives):
         try:
             self.update_usb_drives(drives)
-            self.page.update()
+            request_update(self.page)
         except Exception as e:
             print(f"Error in update_usb_drives_callback: {str(e)}")
     
@@ -595,14 +694,14 @@ class Spot:
             # Use snackbar for notification
             self.snack_bar.content = ft.Text("Please select a USB drive first", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
             return
         
         if not self.wo_data.get("dat_file"):
             # Use snackbar for notification
             self.snack_bar.content = ft.Text("No SW file available for copying", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
             return
             
         success, message = self.ro_tools.create_robot_sw(self.usb_dropdown.value, self.wo_data)
@@ -624,11 +723,11 @@ class Spot:
             )
         
         self.snack_bar.open = True
-        self.page.update()
+        request_update(self.page)
     
     def on_usb_dropdown_change(self, e):
         self.update_usb_version_label()
-        self.page.update()
+        request_update(self.page)
     
     def open_file(self, file_path):
         success = self.ro_tools.open_file(file_path)
@@ -636,7 +735,7 @@ class Spot:
             # Use snackbar for notification
             self.snack_bar.content = ft.Text("Failed to open the file", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
 
     def open_dialog(self, e):
         if not self.dlg_modal.open:
@@ -645,8 +744,7 @@ class Spot:
             self.status_dropdown.visible = self.controller.config.is_dashboard_test_mode_enabled()
             
             if self.wo_found:
-                drives = self.ro_tools.get_connected_usb_drives()
-                self.update_usb_drives(drives)
+                self.refresh_usb_drives_async()
                 
             self.robot_info_section.visible = self.wo_found
             self.usb_section.visible = self.wo_found
@@ -658,14 +756,14 @@ class Spot:
                 self.open_orderfil_button.visible = False
                 self.move_backups_button.visible = False
             self.dlg_modal.open = True
-            self.page.update()
+            request_update(self.page)
         if self.wo_found:
             self.ro_tools.register_usb_detection_callback(self.update_usb_drives_callback)
 
     def handle_close(self, e):
         if self.dlg_modal.open:
             self.dlg_modal.open = False
-            self.page.update()
+            request_update(self.page)
         # Unsubscribe from callback on close to avoid leaks
         self.ro_tools.unregister_usb_detection_callback(self.update_usb_drives_callback)
     
@@ -691,14 +789,13 @@ class Spot:
         
         # Update background color based on status
         self.update_Color()
-        self.page.update()
+        request_update(self.page)
     
     def update_border(self):
         # Border should not change automatically when starting the timer or opening the modal window
         # No longer change border color depending on wo_found or timer
         self.container.border = spot_style["main"]["border"]
-        if self.container.page:
-            self.container.update()
+        request_update(self.page, self.container)
 
     def update_Color(self):
         spot = self.controller.get_spot_data(int(self.station_id), self.spot_id)
@@ -712,17 +809,14 @@ class Spot:
         self.status_bar.bgcolor = new_Color
         # Do not change border, only status bar
         self.status_dropdown.visible = self.controller.config.is_dashboard_test_mode_enabled()
-        if self.container.page:
-            self.status_bar.update()
-        if self.status_dropdown.page:
-            self.status_dropdown.update()
+        request_update(self.page, self.status_bar, self.status_dropdown)
 
     def reset_spot(self, e):
         default_status = self.controller.config.get_status_names()[0]
         self.controller.set_spot_status(int(self.station_id), self.spot_id, default_status)
-        spot = self.controller.get_spot_data(int(self.station_id), self.spot_id)
-        spot["wo_number"] = ""
+        self.controller.set_wo_number(int(self.station_id), self.spot_id, "")
         self.wo_number_dropdown.value = ""
+        self.cancel_wo_lookup()
         
         
         self.file_buttons_container.content = ft.Row([])
@@ -752,7 +846,7 @@ class Spot:
         self.timer.reset()
         self.status_dropdown.value = default_status
         self.update_Color()
-        self.page.update()
+        request_update(self.page)
         
         # Stop USB monitoring
         self.ro_tools.unregister_usb_detection_callback(self.update_usb_drives_callback)
@@ -769,7 +863,7 @@ class Spot:
             # Use snackbar for notification
             self.snack_bar.content = ft.Text("No E-number information available", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
             return
         
         e_number = self.wo_data["e_number"].get("e_number")
@@ -777,7 +871,7 @@ class Spot:
             # Use snackbar for notification
             self.snack_bar.content = ft.Text("No E-number found", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
             return
         
         success, message = self.ro_tools.find_and_open_dt_file(e_number)
@@ -785,14 +879,14 @@ class Spot:
         # Use snackbar for notification
         self.snack_bar.content = ft.Text(message, font_family="Roboto-Light")
         self.snack_bar.open = True
-        self.page.update()
+        request_update(self.page)
 
     def on_create_aoa_click(self, e):
         if not self.usb_dropdown.value:
             # Use snackbar for notification
             self.snack_bar.content = ft.Text("Please select a USB drive first", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
             return
         
         # Check that we have WO number and E-number
@@ -806,13 +900,13 @@ class Spot:
         if not wo_number or len(wo_number) != 8:
             self.snack_bar.content = ft.Text("Valid WO number is required", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
             return
                 
         if not e_number:
             self.snack_bar.content = ft.Text("No E-number found for this WO", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
             return
         
         # Call method to create folder
@@ -821,38 +915,70 @@ class Spot:
         # Use snackbar for notification
         self.snack_bar.content = ft.Text(message, font_family="Roboto-Light")
         self.snack_bar.open = True
-        self.page.update()
+        request_update(self.page)
 
     def on_move_backups_click(self, e):
         if not self.usb_dropdown.value:
             # Use snackbar for notification
             self.snack_bar.content = ft.Text("Please select a USB drive first", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
             return
         
         # Show message that moving process has started
         self.snack_bar.content = ft.Text("Moving backup folders, please wait...", font_family="Roboto-Light")
         self.snack_bar.open = True
-        self.page.update()
+        request_update(self.page)
         
-        # Start moving process directly
+        self.move_backups_button.disabled = True
+        self.backup_progress_bar.value = 0
+        self.backup_progress_bar.visible = True
+        self.backup_progress_text.value = "Preparing..."
+        self.backup_progress_text.visible = True
+        request_update(self.page)
+        
+        # Copy runs on the I/O pool so the UI stays responsive
+        future = _io_executor.submit(
+            self.ro_tools.move_backup_folders, self.usb_dropdown.value, self.on_backup_progress
+        )
+        future.add_done_callback(self._on_move_backups_done)
+
+    def on_backup_progress(self, done, total, rate, eta):
+        """Progress callback from the transfer engine (worker thread)"""
+        call_on_ui(self.page, self._show_backup_progress, done, total, rate, eta)
+
+    def _show_backup_progress(self, done, total, rate, eta):
         try:
-            success, message = self.ro_tools.move_backup_folders(self.usb_dropdown.value)
-            
-            # Show operation result
-            self.snack_bar.content = ft.Text(message, font_family="Roboto-Light")
-            self.snack_bar.open = True
-            self.page.update()
-            
+            self.backup_progress_bar.value = done / total if total else 1
+            eta_text = f", {int(eta // 60)}:{int(eta % 60):02d} left" if eta is not None else ""
+            self.backup_progress_text.value = (
+                f"{done / (1024 * 1024):.1f} / {total / (1024 * 1024):.1f} MB, "
+                f"{rate / (1024 * 1024):.1f} MB/s{eta_text}"
+            )
+            request_update(self.page)
+        except Exception as e:
+            print(f"Error updating backup progress: {str(e)}")
+
+    def _on_move_backups_done(self, future):
+        try:
+            success, message = future.result()
         except Exception as ex:
             print(f"Error moving backups: {str(ex)}")
             traceback.print_exc()
-                
-            # Show error message
-            self.snack_bar.content = ft.Text(f"Error moving backups: {str(ex)}", font_family="Roboto-Light")
-            self.snack_bar.open = True
-            self.page.update()
+            message = f"Error moving backups: {str(ex)}"
+        call_on_ui(self.page, self._show_move_backups_result, message)
+
+    def _show_move_backups_result(self, message):
+        self.move_backups_button.disabled = False
+        self.backup_progress_bar.visible = False
+        self.backup_progress_text.visible = False
+        # Show operation result
+        self.snack_bar.content = ft.Text(message, font_family="Roboto-Light")
+        self.snack_bar.open = True
+        try:
+            request_update(self.page)
+        except Exception as e:
+            print(f"Error updating page after moving backups: {str(e)}")
 
     def on_open_orderfil_click(self, e):
         """Open orderfil.dat button handler"""
@@ -860,7 +986,7 @@ class Spot:
             # Use snackbar for notification
             self.snack_bar.content = ft.Text("Please select a USB drive first", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
             return
             
         # Call method to open orderfil.dat file
@@ -883,7 +1009,7 @@ class Spot:
             )
         
         self.snack_bar.open = True
-        self.page.update()
+        request_update(self.page)
 
     def build(self):
         return self.container
@@ -894,12 +1020,12 @@ class Spot:
         if not wo_number or len(wo_number) != 8:
             self.snack_bar.content = ft.Text("No valid WO number available", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
             return
         success, message = self.ro_tools.find_and_open_sw_file(wo_number)
         self.snack_bar.content = ft.Text(message, font_family="Roboto-Light")
         self.snack_bar.open = True
-        self.page.update()
+        request_update(self.page)
 
     def on_show_bom_click(self, e):
         """Show BOM button handler"""
@@ -907,12 +1033,12 @@ class Spot:
         if not wo_number or len(wo_number) != 8:
             self.snack_bar.content = ft.Text("No valid WO number available", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
             return
         success, message = self.ro_tools.find_and_open_bom_file(wo_number)
         self.snack_bar.content = ft.Text(message, font_family="Roboto-Light")
         self.snack_bar.open = True
-        self.page.update()
+        request_update(self.page)
 
     def on_generate_dt_click(self, e):
         import threading
@@ -925,31 +1051,31 @@ class Spot:
         if not wo_number or len(wo_number) != 8:
             self.snack_bar.content = ft.Text("Valid WO number is required", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
             return
         if not e_number:
             self.snack_bar.content = ft.Text("No E-number found for this WO", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
             return
         if not usb_path:
             self.snack_bar.content = ft.Text("Please select a USB drive first", font_family="Roboto-Light")
             self.snack_bar.open = True
-            self.page.update()
+            request_update(self.page)
             return
         def run_dt():
             generator = DTGenerator(self.controller.config)
             success, message = generator.generate_dt(wo_number, e_number, usb_path, self.ro_tools, self.snack_bar)
             def close_modal():
                 self.progress_modal.open = False
-                self.page.update()
+                request_update(self.page)
                 self.snack_bar.content = ft.Text(message, font_family="Roboto-Light")
                 self.snack_bar.open = True
-                self.page.update()
-            close_modal()
+                request_update(self.page)
+            call_on_ui(self.page, close_modal)
         # Добавляем прогресс-диалог в overlay, если его там нет
         if self.progress_modal not in self.page.overlay:
             self.page.overlay.append(self.progress_modal)
         self.progress_modal.open = True
-        self.page.update()
+        request_update(self.page)
         threading.Thread(target=run_dt).start()
\ No newline at end of file
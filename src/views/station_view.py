@@ -4,6 +4,7 @@ from controllers.timer_component import TimerComponent
 from .spot_view import Spot
 from .top_bar import TopBar
 from models.user_model import UserModel
+from models.wo_cache import get_cached_wo_details_many
 from styles import FONT_SIZE_CARD_TITLE, FONT_WEIGHT_BOLD
 
 
@@ -18,6 +19,7 @@ class StationView:
         self.update_module = update_module
         self.station_container = None
         self.timer = None
+        self.spot_objects = []
         self.user_sso = UserModel().get_user_by_windows_login() or "Unknown SSO"
 
     def build(self):
@@ -30,11 +32,13 @@ class StationView:
 
         if self.selected_station_id is not None:
             selected_station = self.controller.get_station_by_id(self.selected_station_id)
-         
-            spots = [
-                Spot(f"Spot {i + 1}", str(self.selected_station_id), f"{self.selected_station_id}_{i + 1}", self.page, self.controller).build()
+
+            wo_details = self.prefetch_wo_details(spots_count)
+            self.spot_objects = [
+                Spot(f"Spot {i + 1}", str(self.selected_station_id), f"{self.selected_station_id}_{i + 1}", self.page, self.controller, wo_details)
                 for i in range(spots_count)
             ]
+            spots = [spot.build() for spot in self.spot_objects]
             columns = []
             spot_index = 0
             for i in range(columns_count):
@@ -55,6 +59,30 @@ class StationView:
                 )
             return self.station_container
 
+    def prefetch_wo_details(self, spots_count):
+        """Resolve E-number/model for all saved WOs of this station in a single query"""
+        wo_numbers = []
+        for i in range(spots_count):
+            spot_id = f"{self.selected_station_id}_{i + 1}"
+            wo = self.controller.get_spot_data(self.selected_station_id, spot_id).get("wo_number", "")
+            if wo and len(wo) == 8 and wo.isdigit():
+                wo_numbers.append(wo)
+        try:
+            return get_cached_wo_details_many(wo_numbers)
+        except Exception as ex:
+            # Spots fall back to per-WO lookups
+            print(f"WO details prefetch error: {ex}")
+            return {}
+
+    def dispose(self):
+        """Unsubscribe all spots from shared services before the view is replaced"""
+        for spot in self.spot_objects:
+            try:
+                spot.dispose()
+            except Exception as ex:
+                print(f"Error disposing spot {spot.spot_id}: {ex}")
+        self.spot_objects = []
+
     def on_station_change(self, e):
         if self.stations_count > 1:
             new_station_id = int(e.control.value.split()[-1])